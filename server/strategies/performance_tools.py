@@ -12,6 +12,8 @@ NOTE: Bollinger Z-Score is intentionally NOT included in comprehensive analysis.
 """
 
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List
 
@@ -22,6 +24,47 @@ import yfinance as yf
 # Store strategy functions for comprehensive analysis
 STRATEGY_FUNCTIONS: Dict = {}
 
+# Shared OHLCV downloads: the strategy tools for one (symbol, period) are
+# usually called together (the client's run_all_strategies fires all four
+# at once and routes them to the same server process), so they share one
+# yfinance pull instead of fetching four times.
+OHLCV_CACHE_TTL_SECONDS = 300
+_ohlcv_cache: Dict[tuple, tuple] = {}
+_ohlcv_locks: Dict[tuple, threading.Lock] = {}
+_ohlcv_guard = threading.Lock()
+
+
+def _prune_ohlcv_cache() -> None:
+    """Drop expired frames and the locks of keys with nothing cached."""
+    now = time.monotonic()
+    with _ohlcv_guard:
+        for key in [k for k, (expiry, _) in _ohlcv_cache.items() if expiry <= now]:
+            del _ohlcv_cache[key]
+        for key in [k for k, lock in _ohlcv_locks.items() if k not in _ohlcv_cache and not lock.locked()]:
+            del _ohlcv_locks[key]
+
+
+def fetch_ohlcv(symbol: str, period: str) -> pd.DataFrame:
+    """Download OHLCV history once per (symbol, period) and share it.
+
+    Concurrent callers for the same key wait on the in-flight download
+    rather than issuing their own. Each caller gets a copy, so strategies
+    can add columns freely. Empty results are not cached.
+    """
+    key = (symbol.upper(), period)
+    with _ohlcv_guard:
+        key_lock = _ohlcv_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        cached = _ohlcv_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1].copy()
+        data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+        if not data.empty:
+            with _ohlcv_guard:
+                _ohlcv_cache[key] = (time.monotonic() + OHLCV_CACHE_TTL_SECONDS, data)
+    _prune_ohlcv_cache()
+    return data.copy()
+
 
 def calculate_strategy_performance_metrics(data: pd.DataFrame, signal_column: str) -> Dict:
     """Calculate comprehensive performance metrics for a strategy"""
@@ -156,7 +199,7 @@ def add_bollinger_zscore_performance_tool(mcp):
         """
         try:
             # Fetch data
-            data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+            data = fetch_ohlcv(symbol, period)
             if data.empty:
                 return f"Error: No data found for symbol {symbol}"
             
@@ -227,7 +270,7 @@ def add_bollinger_fibonacci_performance_tool(mcp):
         """
         try:
             # Fetch data
-            data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+            data = fetch_ohlcv(symbol, period)
             if data.empty:
                 return f"Error: No data found for symbol {symbol}"
             
@@ -310,7 +353,7 @@ def add_macd_donchian_performance_tool(mcp):
         """
         try:
             # Fetch data
-            data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+            data = fetch_ohlcv(symbol, period)
             if data.empty:
                 return f"Error: No data found for symbol {symbol}"
             
@@ -416,7 +459,7 @@ def add_connors_zscore_performance_tool(mcp):
         """
         try:
             # Fetch data
-            data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+            data = fetch_ohlcv(symbol, period)
             if data.empty:
                 return f"Error: No data found for symbol {symbol}"
             
@@ -507,7 +550,7 @@ def add_dual_ma_performance_tool(mcp):
         """
         try:
             # Fetch data
-            data = yf.download(symbol, period=period, progress=False, multi_level_index=False)
+            data = fetch_ohlcv(symbol, period)
             if data.empty:
                 return f"Error: No data found for symbol {symbol}"
             
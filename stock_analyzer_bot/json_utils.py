@@ -0,0 +1,34 @@
+"""JSON serialization shared by the MCP client and the result formatters."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # Optional: orjson serializes structured tool content several times faster.
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ["dumps_json"]
+
+
+def dumps_json(payload: Any) -> str:
+    """Serialize payload as 2-space indented JSON.
+
+    Uses orjson when installed and falls back to json.dumps(payload, indent=2)
+    for payloads orjson rejects (e.g. non-str dict keys) and for output with
+    non-ASCII characters, so those stay \\uXXXX-escaped as before.
+
+    With orjson, two things differ from json.dumps: NaN and Infinity are
+    written as null (json writes the non-standard NaN/Infinity tokens), and
+    float exponents drop the '+' sign (1e16 rather than 1e+16).
+    """
+    if orjson is not None:
+        try:
+            text = orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+        else:
+            if text.isascii():
+                return text
+    return json.dumps(payload, indent=2)
@@ -18,29 +18,35 @@ All analysis outputs must be well-documented with:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import logging
 import os
 import re
+import threading
 from typing import Any, Dict, Optional
 
 from smolagents import InferenceClientModel, LiteLLMModel, ToolCallingAgent
 
+from .json_utils import dumps_json
 from .mcp_client import configure_session, shutdown_session
 from .tools import (
     HIGH_LEVEL_TOOLS,
     comprehensive_performance_report,
     configure_finance_tools,
     fundamental_analysis_report,
-    shutdown_finance_tools,
     unified_market_scanner,
 )
 
+logger = logging.getLogger(__name__)
+
 __all__ = [
     "run_technical_analysis",
     "run_market_scanner",
     "run_fundamental_analysis",
     "run_multi_sector_analysis",
     "run_combined_analysis",
+    "reset_model_cache",
     "DEFAULT_MODEL_ID",
     "DEFAULT_MODEL_PROVIDER",
     "DEFAULT_MAX_STEPS",
@@ -63,6 +69,20 @@ DEFAULT_MAX_TOKENS = int(os.getenv("SMOLAGENT_MAX_TOKENS", "8192"))
 # Agent Result Formatting Helper
 # ===========================================================================
 
+# Compiled once; format_agent_result runs on every agent result.
+_RESULT_KEYS = ("answer", "output", "result", "report", "content")
+_MISSING = object()
+# Only the {"answer": " opening is matched; the body is sliced, not scanned
+_JSON_ANSWER_PREFIX_RE = re.compile(r'^\s*\{\s*"answer"\s*:\s*"')
+_EXCESS_NL_RE = re.compile(r'\n{4,}')
+_ESC_MAP = {'\\n': '\n', '\\t': '\t', '\\r': '\r'}
+_ESC_RE = re.compile(r'\\[ntr]')
+
+
+def _expand_escape(match: re.Match) -> str:
+    return _ESC_MAP[match.group(0)]
+
+
 def format_agent_result(result: Any) -> str:
     """
     Format the result from agent.run() into a clean string.
@@ -85,16 +105,24 @@ def format_agent_result(result: Any) -> str:
     if result is None:
         return "No report generated"
     
+    # Plain-text reports with nothing to unwrap, unescape or collapse
+    if (
+        isinstance(result, str)
+        and '\\' not in result
+        and '\n\n\n\n' not in result
+        and not result.lstrip().startswith('{')
+    ):
+        return result.strip()
+    
     # Convert to string first for unified processing
     if isinstance(result, dict):
         # Check for common keys that contain the actual answer
-        for key in ["answer", "output", "result", "report", "content"]:
-            if key in result:
-                text = str(result[key])
-                break
+        value = next((result[k] for k in _RESULT_KEYS if k in result), _MISSING)
+        if value is not _MISSING:
+            text = str(value)
         else:
             try:
-                text = json.dumps(result, indent=2)
+                text = dumps_json(result)
             except (TypeError, ValueError):
                 text = str(result)
     else:
@@ -104,66 +132,76 @@ def format_agent_result(result: Any) -> str:
     # Pattern 1: {"answer":"content"} or {"answer": "content"}
     # Pattern 2: String starting with {"answer":
     
-    # Try to extract content from JSON wrapper
-    json_patterns = [
-        r'^\s*\{\s*"answer"\s*:\s*"(.*)"\s*\}\s*$',  # Full JSON object
-        r'^\s*\{\s*"answer"\s*:\s*"(.*)',  # Partial JSON (truncated end)
-        r'^\s*\{"answer":"(.*)',  # Compact JSON start
-    ]
-    
-    for pattern in json_patterns:
-        match = re.match(pattern, text, re.DOTALL)
-        if match:
-            text = match.group(1)
-            # Remove trailing "} if present from truncated JSON
-            if text.endswith('"}'):
-                text = text[:-2]
-            elif text.endswith('"'):
-                text = text[:-1]
-            break
-    
-    # Also try standard JSON parsing
-    if text.strip().startswith('{'):
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                for key in ["answer", "output", "result", "report", "content"]:
-                    if key in parsed:
-                        text = str(parsed[key])
-                        break
-        except (json.JSONDecodeError, TypeError):
-            pass  # Keep text as-is if JSON parsing fails
-    
-    # Ensure text is a string
-    text = str(text) if not isinstance(text, str) else text
+    # Plain markdown reports skip the JSON handling entirely
+    stripped = text.strip()
+    if stripped.startswith('{'):
+        # Well-formed JSON: one C-level parse, no regex needed. Output cut off
+        # at max_tokens has no closing brace and goes straight to the fallback.
+        parsed = None
+        if stripped.endswith('}'):
+            try:
+                parsed = json.loads(stripped)
+            except (json.JSONDecodeError, TypeError):
+                pass
+        
+        if isinstance(parsed, dict):
+            value = next((parsed[k] for k in _RESULT_KEYS if k in parsed), _MISSING)
+            if value is not _MISSING:
+                text = str(value)
+        elif parsed is None:
+            # Truncated JSON: take everything after the {"answer": " opening
+            match = _JSON_ANSWER_PREFIX_RE.match(text)
+            if match:
+                text = text[match.end():].rstrip()
+                # Remove trailing "} (or a lone ") if present from truncated JSON
+                if text.endswith('}'):
+                    closed = text[:-1].rstrip()
+                    if closed.endswith('"'):
+                        text = closed[:-1]
+                else:
+                    text = text.removesuffix('"')
     
-    # Replace literal escape sequences with actual characters
-    text = text.replace('\\n', '\n')
-    text = text.replace('\\t', '\t')
-    text = text.replace('\\r', '\r')
+    # Replace literal escape sequences with actual characters (one pass,
+    # skipped when there is no backslash at all)
+    if '\\' in text:
+        text = _ESC_RE.sub(_expand_escape, text)
     
     # Clean up any excessive newlines (more than 3 consecutive)
-    while '\n\n\n\n' in text:
-        text = text.replace('\n\n\n\n', '\n\n\n')
+    text = _EXCESS_NL_RE.sub('\n\n\n', text)
     
-    return text.strip()
+    # Most reports are already trimmed ASCII; skip the strip() copy in that
+    # case (non-ASCII text may end in Unicode whitespace such as NBSP)
+    return text if text and text.isascii() and text[0] > ' ' and text[-1] > ' ' else text.strip()
 
 
-def build_model(
+# Model clients are reused across runs so LiteLLM / HF HTTP sessions are not
+# rebuilt on every call. Secrets are hashed before they become cache keys.
+_MODEL_CACHE: Dict[tuple, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_CACHE_SIZE = 8
+
+
+def _secret_digest(secret: Optional[str]) -> Optional[str]:
+    if not secret:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+def reset_model_cache() -> None:
+    """Drop cached model clients (e.g. after rotating API keys)."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+def _create_model(
     model_id: str,
     provider: str,
-    api_key: Optional[str] = None,
-    hf_token: Optional[str] = None,
-    api_base: Optional[str] = None,
-    temperature: float = DEFAULT_TEMPERATURE,
-    max_tokens: int = DEFAULT_MAX_TOKENS,
+    api_key: Optional[str],
+    hf_token: Optional[str],
+    api_base: Optional[str],
+    temperature: float,
+    max_tokens: int,
 ):
-    """
-    Create an LLM model instance for ToolCallingAgent.
-    
-    Note: LiteLLMModel passes additional kwargs to the LiteLLM completion call.
-    We pass temperature and max_tokens to control output generation.
-    """
     if provider == "litellm":
         # LiteLLMModel accepts model_id, api_key, api_base, and additional kwargs
         # that get passed to litellm.completion()
@@ -178,8 +216,6 @@ def build_model(
             kwargs["api_base"] = api_base
         
         # Log configuration for debugging
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info(
             "Creating LiteLLMModel: model=%s, temperature=%s, max_tokens=%s",
             model_id, temperature, max_tokens
@@ -187,15 +223,54 @@ def build_model(
         
         return LiteLLMModel(**kwargs)
     else:
-        token = hf_token or os.getenv("HF_TOKEN")
         return InferenceClientModel(
             model_id=model_id,
-            token=token,
+            token=hf_token,
             temperature=temperature,
             max_tokens=max_tokens,
         )
 
 
+def build_model(
+    model_id: str,
+    provider: str,
+    api_key: Optional[str] = None,
+    hf_token: Optional[str] = None,
+    api_base: Optional[str] = None,
+    temperature: float = DEFAULT_TEMPERATURE,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+):
+    """
+    Create (or reuse) an LLM model instance for ToolCallingAgent.
+    
+    Note: LiteLLMModel passes additional kwargs to the LiteLLM completion call.
+    We pass temperature and max_tokens to control output generation.
+    
+    Returned instances are shared between runs and must not be mutated.
+    """
+    if provider != "litellm":
+        hf_token = hf_token or os.getenv("HF_TOKEN")
+    key = (
+        model_id,
+        provider,
+        _secret_digest(api_key),
+        _secret_digest(hf_token),
+        api_base,
+        temperature,
+        max_tokens,
+    )
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _create_model(
+                model_id, provider, api_key, hf_token, api_base, temperature, max_tokens
+            )
+            if len(_MODEL_CACHE) >= _MODEL_CACHE_SIZE:
+                _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
+            _MODEL_CACHE[key] = model
+        return model
+
+
 def build_agent(model, tools: list, max_steps: int = DEFAULT_MAX_STEPS):
     """Create a ToolCallingAgent with HIGH-LEVEL tools."""
     return ToolCallingAgent(
@@ -1076,48 +1151,44 @@ def main():
     
     args = parser.parse_args()
     
-    try:
-        if args.mode == "technical":
-            result = run_technical_analysis(
-                symbol=args.symbol,
-                period=args.period,
-                model_id=args.model_id,
-                model_provider=args.model_provider,
-                max_steps=args.max_steps,
-                temperature=args.temperature,
-            )
-        elif args.mode == "scanner":
-            result = run_market_scanner(
-                symbols=args.symbol,
-                period=args.period,
-                model_id=args.model_id,
-                model_provider=args.model_provider,
-                max_steps=args.max_steps,
-                temperature=args.temperature,
-            )
-        elif args.mode == "fundamental":
-            result = run_fundamental_analysis(
-                symbol=args.symbol,
-                period=args.period,
-                model_id=args.model_id,
-                model_provider=args.model_provider,
-                max_steps=args.max_steps,
-                temperature=args.temperature,
-            )
-        elif args.mode == "combined":
-            result = run_combined_analysis(
-                symbol=args.symbol,
-                technical_period=args.period,
-                model_id=args.model_id,
-                model_provider=args.model_provider,
-                max_steps=args.max_steps,
-                temperature=args.temperature,
-            )
-        
-        print(result)
-        
-    finally:
-        shutdown_finance_tools()
+    if args.mode == "technical":
+        result = run_technical_analysis(
+            symbol=args.symbol,
+            period=args.period,
+            model_id=args.model_id,
+            model_provider=args.model_provider,
+            max_steps=args.max_steps,
+            temperature=args.temperature,
+        )
+    elif args.mode == "scanner":
+        result = run_market_scanner(
+            symbols=args.symbol,
+            period=args.period,
+            model_id=args.model_id,
+            model_provider=args.model_provider,
+            max_steps=args.max_steps,
+            temperature=args.temperature,
+        )
+    elif args.mode == "fundamental":
+        result = run_fundamental_analysis(
+            symbol=args.symbol,
+            period=args.period,
+            model_id=args.model_id,
+            model_provider=args.model_provider,
+            max_steps=args.max_steps,
+            temperature=args.temperature,
+        )
+    elif args.mode == "combined":
+        result = run_combined_analysis(
+            symbol=args.symbol,
+            technical_period=args.period,
+            model_id=args.model_id,
+            model_provider=args.model_provider,
+            max_steps=args.max_steps,
+            temperature=args.temperature,
+        )
+    
+    print(result)
 
 
 if __name__ == "__main__":
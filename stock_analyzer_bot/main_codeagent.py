@@ -9,7 +9,16 @@ LOW-LEVEL TOOLS USED:
 - macd_donchian_analysis: Single strategy, single stock
 - connors_zscore_analysis: Single strategy, single stock
 - dual_moving_average_analysis: Single strategy, single stock
+- run_all_strategies: All 4 strategies for one stock, called concurrently
+- scan_symbols: All 4 strategies for many stocks, called concurrently
 - fundamental_analysis_report: Financial statements (also for combined analysis)
+- combined_analysis: Strategies + fundamentals for one stock, called concurrently
+- graded_fundamental_report: Fundamental report with a locally computed grade
+- parse_strategy_metrics: Local parser for strategy metrics (no MCP call)
+- parse_signal: Local parser for the current BUY/SELL/HOLD signal (no MCP call)
+- parse_signal_strength: Local rater for the strongest signal wording (no MCP call)
+- parse_fundamental_outlook: Local classifier for fundamental reports (no MCP call)
+- classify_signals: Verdict table lookup from BUY/SELL vote counts (no MCP call)
 
 RECOMMENDATION DOCUMENTATION GUIDELINES:
 All analysis outputs must be well-documented with:
@@ -21,31 +30,36 @@ All analysis outputs must be well-documented with:
 from __future__ import annotations
 
 import argparse
+import atexit
+import functools
+import hashlib
+import importlib.util
 import json
+import logging
+import multiprocessing
 import os
 import re
-from typing import Any, Dict, Literal, Optional, Union
-
-from smolagents import CodeAgent, InferenceClientModel, LiteLLMModel
-
-from .mcp_client import configure_session, shutdown_session
-from .tools import (
-    LOW_LEVEL_TOOLS,
-    bollinger_fibonacci_analysis,
-    configure_finance_tools,
-    connors_zscore_analysis,
-    dual_moving_average_analysis,
-    fundamental_analysis_report,
-    macd_donchian_analysis,
-    shutdown_finance_tools,
-)
+import socket
+import string
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, Union
+
+# smolagents, the MCP client and the tool wrappers are imported where they
+# are used, so `--help` and argument errors return without loading them.
+
+logger = logging.getLogger(__name__)
 
 __all__ = [
     "run_technical_analysis",
     "run_market_scanner",
+    "run_sharded_market_scanner",
     "run_fundamental_analysis",
     "run_multi_sector_analysis",
     "run_combined_analysis",
+    "reset_model_cache",
     "DEFAULT_EXECUTOR",
     "DEFAULT_MAX_TOKENS",
 ]
@@ -60,12 +74,37 @@ DEFAULT_MAX_STEPS = int(os.getenv("SMOLAGENT_MAX_STEPS", "20"))
 DEFAULT_EXECUTOR = os.getenv("SMOLAGENT_EXECUTOR", "local")
 DEFAULT_TEMPERATURE = float(os.getenv("SMOLAGENT_TEMPERATURE", "0.1"))
 DEFAULT_MAX_TOKENS = int(os.getenv("SMOLAGENT_MAX_TOKENS", "8192"))
+SCANNER_SHARD_THRESHOLD = 8  # CLI scans above this many symbols run in worker processes
+
+# Separators in a symbol list (e.g. "aapl, BRK.B ^GSPC,EURUSD=X"). Tickers
+# themselves are not restricted, so index and FX symbols pass through.
+_SYM_SEP_RE = re.compile(r"[,\s]+")
+
+
+@functools.lru_cache(maxsize=64)
+def _split_symbols(symbols: str) -> Tuple[str, ...]:
+    """Split, upper-case and de-duplicate a symbol list (cached per string)."""
+    return tuple(dict.fromkeys(s.upper() for s in _SYM_SEP_RE.split(symbols.strip()) if s))
 
 
 # ===========================================================================
 # Agent Result Formatting Helper
 # ===========================================================================
 
+# Compiled once; format_agent_result runs on every agent result.
+_RESULT_KEYS = ("answer", "output", "result", "report", "content")
+_MISSING = object()
+# Only the {"answer": " opening is matched; the body is sliced, not scanned
+_JSON_ANSWER_PREFIX_RE = re.compile(r'^\s*\{\s*"answer"\s*:\s*"')
+_EXCESS_NL_RE = re.compile(r'\n{4,}')
+_ESC_MAP = {'\\n': '\n', '\\t': '\t', '\\r': '\r'}
+_ESC_RE = re.compile(r'\\[ntr]')
+
+
+def _expand_escape(match: re.Match) -> str:
+    return _ESC_MAP[match.group(0)]
+
+
 def format_agent_result(result: Any) -> str:
     """
     Format the result from agent.run() into a clean string.
@@ -88,16 +127,26 @@ def format_agent_result(result: Any) -> str:
     if result is None:
         return "No report generated"
     
+    # Plain-text reports with nothing to unwrap, unescape or collapse
+    if (
+        isinstance(result, str)
+        and '\\' not in result
+        and '\n\n\n\n' not in result
+        and not result.lstrip().startswith('{')
+    ):
+        return result.strip()
+    
     # Convert to string first for unified processing
     if isinstance(result, dict):
         # Check for common keys that contain the actual answer
-        for key in ["answer", "output", "result", "report", "content"]:
-            if key in result:
-                text = str(result[key])
-                break
+        value = next((result[k] for k in _RESULT_KEYS if k in result), _MISSING)
+        if value is not _MISSING:
+            text = str(value)
         else:
+            from .json_utils import dumps_json
+
             try:
-                text = json.dumps(result, indent=2)
+                text = dumps_json(result)
             except (TypeError, ValueError):
                 text = str(result)
     else:
@@ -107,61 +156,129 @@ def format_agent_result(result: Any) -> str:
     # Pattern 1: {"answer":"content"} or {"answer": "content"}
     # Pattern 2: String starting with {"answer":
     
-    # Try to extract content from JSON wrapper
-    json_patterns = [
-        r'^\s*\{\s*"answer"\s*:\s*"(.*)"\s*\}\s*$',  # Full JSON object
-        r'^\s*\{\s*"answer"\s*:\s*"(.*)',  # Partial JSON (truncated end)
-        r'^\s*\{"answer":"(.*)',  # Compact JSON start
-    ]
-    
-    for pattern in json_patterns:
-        match = re.match(pattern, text, re.DOTALL)
-        if match:
-            text = match.group(1)
-            # Remove trailing "} if present from truncated JSON
-            if text.endswith('"}'):
-                text = text[:-2]
-            elif text.endswith('"'):
-                text = text[:-1]
-            break
-    
-    # Also try standard JSON parsing
-    if text.strip().startswith('{'):
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                for key in ["answer", "output", "result", "report", "content"]:
-                    if key in parsed:
-                        text = str(parsed[key])
-                        break
-        except (json.JSONDecodeError, TypeError):
-            pass  # Keep text as-is if JSON parsing fails
-    
-    # Ensure text is a string
-    text = str(text) if not isinstance(text, str) else text
+    # Plain markdown reports skip the JSON handling entirely
+    stripped = text.strip()
+    if stripped.startswith('{'):
+        # Well-formed JSON: one C-level parse, no regex needed. Output cut off
+        # at max_tokens has no closing brace and goes straight to the fallback.
+        parsed = None
+        if stripped.endswith('}'):
+            try:
+                parsed = json.loads(stripped)
+            except (json.JSONDecodeError, TypeError):
+                pass
+        
+        if isinstance(parsed, dict):
+            value = next((parsed[k] for k in _RESULT_KEYS if k in parsed), _MISSING)
+            if value is not _MISSING:
+                text = str(value)
+        elif parsed is None:
+            # Truncated JSON: take everything after the {"answer": " opening
+            match = _JSON_ANSWER_PREFIX_RE.match(text)
+            if match:
+                text = text[match.end():].rstrip()
+                # Remove trailing "} (or a lone ") if present from truncated JSON
+                if text.endswith('}'):
+                    closed = text[:-1].rstrip()
+                    if closed.endswith('"'):
+                        text = closed[:-1]
+                else:
+                    text = text.removesuffix('"')
     
-    # Replace literal escape sequences with actual characters
-    text = text.replace('\\n', '\n')
-    text = text.replace('\\t', '\t')
-    text = text.replace('\\r', '\r')
+    # Replace literal escape sequences with actual characters (one pass,
+    # skipped when there is no backslash at all)
+    if '\\' in text:
+        text = _ESC_RE.sub(_expand_escape, text)
     
     # Clean up any excessive newlines (more than 3 consecutive)
-    while '\n\n\n\n' in text:
-        text = text.replace('\n\n\n\n', '\n\n\n')
+    text = _EXCESS_NL_RE.sub('\n\n\n', text)
     
-    return text.strip()
+    # Most reports are already trimmed ASCII; skip the strip() copy in that
+    # case (non-ASCII text may end in Unicode whitespace such as NBSP)
+    return text if text and text.isascii() and text[0] > ' ' and text[-1] > ' ' else text.strip()
 
 
-def build_model(
+# Model clients are reused across runs so LiteLLM / HF HTTP sessions are not
+# rebuilt on every call. Secrets are hashed before they become cache keys.
+_MODEL_CACHE: Dict[tuple, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_CACHE_SIZE = 8
+
+
+def _secret_digest(secret: Optional[str]) -> Optional[str]:
+    if not secret:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+
+def reset_model_cache() -> None:
+    """Drop cached model clients, the agents built on them and the pooled HTTP session."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+    _drop_pooled_agents()
+    _remove_pooled_http_client()
+
+
+# One keep-alive HTTP client shared by every LiteLLM call in the process, so
+# agent steps reuse TLS connections instead of renegotiating them. LiteLLM
+# only takes a process-global session, so it is installed only when the host
+# has not configured one, and removed again by _remove_pooled_http_client.
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _ensure_pooled_http_client() -> None:
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is not None:
+            return
+        try:
+            import httpx
+            import litellm
+        except ImportError:
+            return
+        if litellm.client_session is not None:
+            return
+        _HTTP_CLIENT = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        litellm.client_session = _HTTP_CLIENT
+
+
+def _remove_pooled_http_client(close: bool = False) -> None:
+    """Restore LiteLLM's default session if ours is installed.
+
+    The client is only closed at exit: completions already in flight on
+    other threads may still be using it, and it is released once they finish.
+    """
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            return
+        import litellm
+
+        if litellm.client_session is _HTTP_CLIENT:
+            litellm.client_session = None
+        if close:
+            _HTTP_CLIENT.close()
+        _HTTP_CLIENT = None
+
+
+atexit.register(_remove_pooled_http_client, close=True)
+
+
+def _create_model(
     model_id: str,
     provider: str,
-    api_key: Optional[str] = None,
-    hf_token: Optional[str] = None,
-    api_base: Optional[str] = None,
-    temperature: float = DEFAULT_TEMPERATURE,
-    max_tokens: int = DEFAULT_MAX_TOKENS,
+    api_key: Optional[str],
+    hf_token: Optional[str],
+    api_base: Optional[str],
+    temperature: float,
+    max_tokens: int,
 ):
-    """Create an LLM model instance for CodeAgent."""
+    from smolagents import InferenceClientModel, LiteLLMModel
+
     if provider == "litellm":
         kwargs = {
             "model_id": model_id,
@@ -174,30 +291,102 @@ def build_model(
             kwargs["api_base"] = api_base
         return LiteLLMModel(**kwargs)
     else:
-        token = hf_token or os.getenv("HF_TOKEN")
         return InferenceClientModel(
             model_id=model_id,
-            token=token,
+            token=hf_token,
             temperature=temperature,
             max_tokens=max_tokens,
         )
 
 
+def build_model(
+    model_id: str,
+    provider: str,
+    api_key: Optional[str] = None,
+    hf_token: Optional[str] = None,
+    api_base: Optional[str] = None,
+    temperature: float = DEFAULT_TEMPERATURE,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    use_pooled_client: bool = True,
+):
+    """Create (or reuse) an LLM model instance for CodeAgent.
+
+    With use_pooled_client (LiteLLM only), completions go through a shared
+    keep-alive httpx client installed as litellm.client_session, unless the
+    host process already set its own. The session is process-wide, so
+    use_pooled_client=False removes it again for every LiteLLM caller.
+    """
+    if provider == "litellm":
+        if use_pooled_client:
+            _ensure_pooled_http_client()
+        else:
+            _remove_pooled_http_client()
+    else:
+        hf_token = hf_token or os.getenv("HF_TOKEN")
+    key = (
+        model_id,
+        provider,
+        _secret_digest(api_key),
+        _secret_digest(hf_token),
+        api_base,
+        temperature,
+        max_tokens,
+        use_pooled_client,
+    )
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _create_model(
+                model_id, provider, api_key, hf_token, api_base, temperature, max_tokens
+            )
+            if len(_MODEL_CACHE) >= _MODEL_CACHE_SIZE:
+                _drop_pooled_agents(_MODEL_CACHE.pop(next(iter(_MODEL_CACHE))))
+            _MODEL_CACHE[key] = model
+        return model
+
+
+# Each Docker CodeAgent owns its sandbox. Starting a container costs seconds,
+# so it lives as long as the pooled agent and stays warm between that agent's
+# runs; a pooled agent serves one run at a time and its kernel namespace is
+# reset on checkout, and the container is started with the imports that agent
+# allows. Pooled sandboxes are stopped when the agent is dropped or at exit.
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _new_docker_executor(additional_imports: list):
+    """Start a Docker executor on its own host port."""
+    from smolagents import DockerExecutor
+    from smolagents.monitoring import AgentLogger, LogLevel
+
+    executor = DockerExecutor(
+        additional_imports=additional_imports,
+        logger=AgentLogger(level=LogLevel.INFO),
+        port=_free_port(),
+        build_new_image=False,  # build once if missing, not per container
+    )
+    return executor
+
+
+# Imports the generated code may use. Every entry is listed in the CodeAgent
+# system prompt and checked on each step, so runs only authorize what their
+# prompt template needs.
+FULL_AGENT_IMPORTS = ("statistics", "math", "collections", "re", "datetime", "json")
+
+
 def build_agent(
     model,
     tools: list,
     max_steps: int = DEFAULT_MAX_STEPS,
     executor_type: Literal["local", "e2b", "docker"] = "local",
+    additional_imports: Optional[Tuple[str, ...]] = None,
 ):
     """Create a CodeAgent with LOW-LEVEL tools for Python orchestration."""
-    additional_imports = [
-        "statistics",
-        "math",
-        "collections",
-        "re",
-        "datetime",
-        "json",
-    ]
+    from smolagents import CodeAgent
+
+    additional_imports = additional_imports or ()
     
     agent_kwargs = {
         "tools": tools,
@@ -207,65 +396,197 @@ def build_agent(
         "additional_authorized_imports": additional_imports,
     }
     
-    if executor_type in ("e2b", "docker"):
+    if executor_type == "e2b":
         agent_kwargs["executor_type"] = executor_type
+    elif executor_type == "docker":
+        agent_kwargs["executor"] = _new_docker_executor(list(additional_imports))
     
     return CodeAgent(**agent_kwargs)
 
 
+def build_tool_calling_agent(model, tools: list, max_steps: int = DEFAULT_MAX_STEPS):
+    """Create a ToolCallingAgent for single-tool flows.
+
+    With one tool there is nothing to orchestrate in code, so the CodeAgent
+    system prompt and code-parsing step are pure overhead.
+    """
+    from smolagents import ToolCallingAgent
+
+    return ToolCallingAgent(
+        tools=tools,
+        model=model,
+        max_steps=max_steps,
+        verbosity_level=1,
+    )
+
+
 # ===========================================================================
 # Prompts for LOW-LEVEL Tool Orchestration with Python Code
 # ===========================================================================
 
+# Report scaffolds are not part of the task text: smolagents re-sends the task
+# on every step, so they are injected into the executor as the report_template
+# variable and only the short fill-in code stays in the prompt.
+
+TECHNICAL_REPORT_TEMPLATE = """# {symbol} Technical Analysis Report
+
+## Executive Summary
+{outlook} outlook: {buy_count} BUY, {sell_count} SELL, {hold_count} HOLD signals.
+
+**Period:** {period}
+
+## Technical Indicators Summary
+
+| Strategy | Score | Signal | Key Finding |
+|----------|-------|--------|-------------|
+| Bollinger-Fibonacci | {bb_score} | {bb_signal} | Return {bb_ret}%, Sharpe {bb_sharpe} |
+| MACD-Donchian | {macd_score} | {macd_signal} | Return {macd_ret}%, Sharpe {macd_sharpe} |
+| Connors RSI+Z | {conn_score} | {connors_signal} | Return {conn_ret}%, Sharpe {conn_sharpe} |
+| Dual MA | {dual_score} | {dual_ma_signal} | Return {dual_ret}%, Sharpe {dual_sharpe} |
+
+## Strategy Details
+
+**1. Bollinger-Fibonacci:** {bb_signal} - Return: {bb_ret}%, Sharpe: {bb_sharpe}, Drawdown: {bb_dd}%
+
+**2. MACD-Donchian:** {macd_signal} - Return: {macd_ret}%, Sharpe: {macd_sharpe}, Drawdown: {macd_dd}%
+
+**3. Connors RSI+Z:** {connors_signal} - Return: {conn_ret}%, Sharpe: {conn_sharpe}, Drawdown: {conn_dd}%
+
+**4. Dual MA:** {dual_ma_signal} - Return: {dual_ret}%, Sharpe: {dual_sharpe}, Drawdown: {dual_dd}%
+
+## Consensus
+
+- BUY: {buy_count}/4 | SELL: {sell_count}/4 | HOLD: {hold_count}/4
+- Trend: {trend} | Risk: {risk}
+
+## 🎯 Recommendation: **{overall}**
+
+**Holders:** {holders}
+
+**Buyers:** {buyers}
+
+**Risk:** Position max 5% portfolio
+
+*Disclaimer: Educational purposes only.*
+"""
+
+COMBINED_REPORT_TEMPLATE = """# {symbol} Combined Investment Analysis
+
+## Executive Summary
+
+**Symbol:** {symbol}
+
+**Technical Period:** {tech_period}
+
+**Fundamental Period:** {fund_period}
+
+**COMBINED RECOMMENDATION:** {final_rec}
+
+**Confidence Level:** {confidence}
+
+**Technical/Fundamental Alignment:** {alignment} {align_emoji}
+
+---
+
+## Technical Analysis Summary
+
+### Technical Indicators Table
+
+| Strategy | Signal |
+|----------|--------|
+| Bollinger-Fibonacci | {bb_signal} |
+| MACD-Donchian | {macd_signal} |
+| Connors RSI-ZScore | {connors_signal} |
+| Dual Moving Average | {dual_ma_signal} |
+
+**Technical Verdict:** {tech_outlook} with {tech_buy}/4 BUY signals
+
+---
+
+## Fundamental Analysis Summary
+
+{fund_result}
+
+**Fundamental Verdict:** {fund_outlook}
+
+---
+
+## Alignment Analysis
+
+| Aspect | Technical | Fundamental | Alignment |
+|--------|-----------|-------------|-----------|
+| Overall | {tech_outlook} | {fund_outlook} | {align_emoji} |
+
+**Alignment Status:** {alignment}
+
+---
+
+## 🎯 FINAL RECOMMENDATION: **{final_rec}**
+
+### Why This Recommendation?
+
+**Technical Factors:** {tech_buy}/4 strategies show bullish signals
+
+**Fundamental Factors:** Financial analysis shows {fund_outlook_lower} outlook
+
+**Alignment:** Technical and fundamental views are {alignment_lower}
+
+---
+
+**Disclaimer:** This analysis is for educational purposes only.
+
+"""
+
+
 TECHNICAL_ANALYSIS_PROMPT = """Analyze {symbol} using all 4 technical strategies.
 
 TOOLS TO CALL:
-1. bollinger_fibonacci_analysis(symbol="{symbol}", period="{period}")
-2. macd_donchian_analysis(symbol="{symbol}", period="{period}")
-3. connors_zscore_analysis(symbol="{symbol}", period="{period}")
-4. dual_moving_average_analysis(symbol="{symbol}", period="{period}")
+1. run_all_strategies(symbol="{symbol}", period="{period}") - runs all 4 strategies concurrently
+2. parse_strategy_metrics(text=result) to read return/sharpe/drawdown/score
+3. classify_signals(buy_count, sell_count) for overall/outlook/trend/risk
+
+`report_template` is already defined in your Python environment: fill it with .format(...).
 
 Write Python code to call all tools, extract metrics, and build a CONCISE report.
 
 ```python
 import re
 
-# Call all 4 strategy tools
-bb_result = bollinger_fibonacci_analysis(symbol="{symbol}", period="{period}")
-macd_result = macd_donchian_analysis(symbol="{symbol}", period="{period}")
-connors_result = connors_zscore_analysis(symbol="{symbol}", period="{period}")
-dual_ma_result = dual_moving_average_analysis(symbol="{symbol}", period="{period}")
+symbol = "{symbol}"
+period = "{period}"
+
+# Run all 4 strategy tools in one concurrent call
+results = run_all_strategies(symbol="{symbol}", period="{period}")
+bb_result = results["bollinger_fib"]
+macd_result = results["macd_donchian"]
+connors_result = results["connors_zscore"]
+dual_ma_result = results["dual_ma"]
+
+# Helper to extract signal: one case-insensitive pass, no uppercased copy
+signal_re = re.compile(r"SIGNAL: (BUY|SELL|HOLD)|BUY|SELL", re.IGNORECASE)
 
-# Helper to extract signal
 def get_signal(result):
-    text = result.upper()
-    if "CURRENT SIGNAL: BUY" in text or "SIGNAL: BUY" in text:
-        return "BUY"
-    elif "CURRENT SIGNAL: SELL" in text or "SIGNAL: SELL" in text:
-        return "SELL"
-    elif "CURRENT SIGNAL: HOLD" in text or "SIGNAL: HOLD" in text:
-        return "HOLD"
-    elif "BUY" in text and "SELL" not in text:
-        return "BUY"
-    elif "SELL" in text:
+    labeled = set()
+    bare = set()
+    for match in signal_re.finditer(result):
+        if match.group(1):
+            labeled.add(match.group(1).upper())
+        else:
+            bare.add(match.group(0).upper())
+    for label in ("BUY", "SELL", "HOLD"):
+        if label in labeled:
+            return label
+    if "SELL" in bare:
         return "SELL"
-    return "HOLD"
-
-# Helper to extract numeric value
-def extract_value(text, patterns):
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    return "N/A"
+    return "BUY" if "BUY" in bare else "HOLD"
 
-# Extract metrics from each result
+# Extract metrics from each result (one parsing pass per tool output)
 def get_metrics(result):
-    ret = extract_value(result, [r"Strategy Total Return[:\\s]+([\\-]?[\\d.]+)%", r"Strategy Return[:\\s]+([\\-]?[\\d.]+)%"])
-    sharpe = extract_value(result, [r"Strategy Sharpe Ratio[:\\s]+([\\-]?[\\d.]+)", r"Sharpe Ratio[:\\s]+([\\-]?[\\d.]+)"])
-    dd = extract_value(result, [r"Strategy Max Drawdown[:\\s]+([\\-]?[\\d.]+)%", r"Max Drawdown[:\\s]+([\\-]?[\\d.]+)%"])
-    score = extract_value(result, [r"Combined Score[:\\s]+([\\-]?[\\d.]+)", r"Current BB Score[:\\s]+([\\-]?[\\d.]+)", r"Trend Strength[:\\s]+([\\-]?[\\d.]+)%"])
-    return ret, sharpe, dd, score
+    metrics = parse_strategy_metrics(text=result)
+    return tuple(
+        "N/A" if metrics[key] is None else metrics[key]
+        for key in ("return", "sharpe", "drawdown", "score")
+    )
 
 bb_signal = get_signal(bb_result)
 macd_signal = get_signal(macd_result)
@@ -283,74 +604,30 @@ buy_count = sum(1 for s in signals if "BUY" in s)
 sell_count = sum(1 for s in signals if "SELL" in s)
 hold_count = 4 - buy_count - sell_count
 
-# Determine outlook
-if buy_count >= 3:
-    overall = "STRONG BUY"
-    outlook = "BULLISH"
-elif buy_count >= 2:
-    overall = "BUY"
-    outlook = "MODERATELY BULLISH"
-elif sell_count >= 3:
-    overall = "STRONG SELL"
-    outlook = "BEARISH"
-elif sell_count >= 2:
-    overall = "SELL"
-    outlook = "MODERATELY BEARISH"
-else:
-    overall = "HOLD"
-    outlook = "NEUTRAL"
-
-trend = "Up" if buy_count > sell_count else "Down" if sell_count > buy_count else "Sideways"
-risk = "Low" if buy_count >= 3 or sell_count >= 3 else "Medium" if buy_count >= 2 or sell_count >= 2 else "High"
-
-# Build CONCISE report
-report = f'''# {symbol} Technical Analysis Report
-
-## Executive Summary
-{{outlook}} outlook: {{buy_count}} BUY, {{sell_count}} SELL, {{hold_count}} HOLD signals.
-
-**Period:** {period}
-
-## Technical Indicators Summary
-
-| Strategy | Score | Signal | Key Finding |
-|----------|-------|--------|-------------|
-| Bollinger-Fibonacci | {{bb_score}} | {{bb_signal}} | Return {{bb_ret}}%, Sharpe {{bb_sharpe}} |
-| MACD-Donchian | {{macd_score}} | {{macd_signal}} | Return {{macd_ret}}%, Sharpe {{macd_sharpe}} |
-| Connors RSI+Z | {{conn_score}} | {{connors_signal}} | Return {{conn_ret}}%, Sharpe {{conn_sharpe}} |
-| Dual MA | {{dual_score}} | {{dual_ma_signal}} | Return {{dual_ret}}%, Sharpe {{dual_sharpe}} |
-
-## Strategy Details
-
-**1. Bollinger-Fibonacci:** {{bb_signal}} - Return: {{bb_ret}}%, Sharpe: {{bb_sharpe}}, Drawdown: {{bb_dd}}%
-
-**2. MACD-Donchian:** {{macd_signal}} - Return: {{macd_ret}}%, Sharpe: {{macd_sharpe}}, Drawdown: {{macd_dd}}%
-
-**3. Connors RSI+Z:** {{connors_signal}} - Return: {{conn_ret}}%, Sharpe: {{conn_sharpe}}, Drawdown: {{conn_dd}}%
-
-**4. Dual MA:** {{dual_ma_signal}} - Return: {{dual_ret}}%, Sharpe: {{dual_sharpe}}, Drawdown: {{dual_dd}}%
-
-## Consensus
-
-- BUY: {{buy_count}}/4 | SELL: {{sell_count}}/4 | HOLD: {{hold_count}}/4
-- Trend: {{trend}} | Risk: {{risk}}
-
-## 🎯 Recommendation: **{{overall}}**
-
-'''
+# Determine outlook (precomputed verdict table lookup)
+verdict = classify_signals(buy_count=buy_count, sell_count=sell_count)
+overall = verdict["overall"]
+outlook = verdict["outlook"]
+trend = verdict["trend"]
+risk = verdict["risk"]
 
+# Fill the preloaded report_template (do not redefine it)
 if "BUY" in overall:
-    report += "**Holders:** ✅ Hold/add | ❌ Avoid selling\\n\\n"
-    report += "**Buyers:** BUY - Watch: 📊 Volume confirmation\\n\\n"
+    holders, buyers = "✅ Hold/add | ❌ Avoid selling", "BUY - Watch: 📊 Volume confirmation"
 elif "SELL" in overall:
-    report += "**Holders:** ✅ Reduce position | ❌ Avoid adding\\n\\n"
-    report += "**Buyers:** WAIT - Watch: 📊 Reversal signals\\n\\n"
+    holders, buyers = "✅ Reduce position | ❌ Avoid adding", "WAIT - Watch: 📊 Reversal signals"
 else:
-    report += "**Holders:** ✅ Hold | ❌ Avoid large positions\\n\\n"
-    report += "**Buyers:** WAIT - Watch: 📊 Clearer signals\\n\\n"
-
-report += "**Risk:** Position max 5% portfolio\\n\\n"
-report += "*Disclaimer: Educational purposes only.*\\n"
+    holders, buyers = "✅ Hold | ❌ Avoid large positions", "WAIT - Watch: 📊 Clearer signals"
+
+report = report_template.format(
+    symbol=symbol, period=period, outlook=outlook, overall=overall, trend=trend, risk=risk,
+    buy_count=buy_count, sell_count=sell_count, hold_count=hold_count,
+    bb_signal=bb_signal, bb_score=bb_score, bb_ret=bb_ret, bb_sharpe=bb_sharpe, bb_dd=bb_dd,
+    macd_signal=macd_signal, macd_score=macd_score, macd_ret=macd_ret, macd_sharpe=macd_sharpe, macd_dd=macd_dd,
+    connors_signal=connors_signal, conn_score=conn_score, conn_ret=conn_ret, conn_sharpe=conn_sharpe, conn_dd=conn_dd,
+    dual_ma_signal=dual_ma_signal, dual_score=dual_score, dual_ret=dual_ret, dual_sharpe=dual_sharpe, dual_dd=dual_dd,
+    holders=holders, buyers=buyers,
+)
 
 final_answer(report)
 ```
@@ -365,145 +642,105 @@ REQUIREMENTS:
 
 MARKET_SCANNER_PROMPT = """Scan and compare these stocks: {symbols}
 
-TOOLS TO CALL (for each stock):
-1. bollinger_fibonacci_analysis(symbol, period)
-2. macd_donchian_analysis(symbol, period)
-3. connors_zscore_analysis(symbol, period)
-4. dual_moving_average_analysis(symbol, period)
+TOOLS TO CALL:
+1. scan_symbols(symbols, period) - runs all 4 strategies for every stock concurrently
+   and returns {{symbol: {{"bollinger_fib", "macd_donchian", "connors_zscore", "dual_ma"}}}}
+2. parse_signal_strength(text) - STRONG BUY/STRONG SELL/BUY/SELL/HOLD of one strategy output
 
 Write Python code to analyze all stocks and create a professional ranking report.
 
 ```python
-import json
-import re
-
 stocks = {symbol_list}
 period = "{period}"
 
-def get_signal(result):
-    text = result.upper()
-    if "STRONG BUY" in text:
-        return "STRONG BUY"
-    elif "STRONG SELL" in text:
-        return "STRONG SELL"
-    elif "BUY" in text:
-        return "BUY"
-    elif "SELL" in text:
-        return "SELL"
-    return "HOLD"
-
-def count_buy_signals(results):
-    count = 0
-    for result in results.values():
-        signal = get_signal(result)
-        if "BUY" in signal:
-            count += 1
-    return count
-
-# Collect all results
-all_data = {{}}
-for stock in stocks:
-    all_data[stock] = {{
-        "bb": bollinger_fibonacci_analysis(symbol=stock, period=period),
-        "macd": macd_donchian_analysis(symbol=stock, period=period),
-        "connors": connors_zscore_analysis(symbol=stock, period=period),
-        "dual_ma": dual_moving_average_analysis(symbol=stock, period=period),
-    }}
+# Collect all results in one concurrent call (no per-stock loop)
+all_data = scan_symbols(symbols=stocks, period=period)
 
-# Parse results
+# Parse results: parse_signal_strength scans each tool output once
 stock_summaries = {{}}
 for stock, results in all_data.items():
-    buy_count = count_buy_signals(results)
-    stock_summaries[stock] = {{
-        "buy_count": buy_count,
-        "bb_signal": get_signal(results["bb"]),
-        "macd_signal": get_signal(results["macd"]),
-        "connors_signal": get_signal(results["connors"]),
-        "dual_ma_signal": get_signal(results["dual_ma"]),
+    signals = {{
+        "bb_signal": parse_signal_strength(text=results["bollinger_fib"]),
+        "macd_signal": parse_signal_strength(text=results["macd_donchian"]),
+        "connors_signal": parse_signal_strength(text=results["connors_zscore"]),
+        "dual_ma_signal": parse_signal_strength(text=results["dual_ma"]),
     }}
+    signals["buy_count"] = sum(1 for signal in signals.values() if "BUY" in signal)
+    stock_summaries[stock] = signals
 
 # Rank stocks
 ranked = sorted(stock_summaries.items(), key=lambda x: x[1]["buy_count"], reverse=True)
 
-# Get recommendations
-def get_recommendation(buy_count):
-    if buy_count >= 3:
-        return "STRONG BUY"
-    elif buy_count >= 2:
-        return "BUY"
-    elif buy_count >= 1:
-        return "HOLD"
-    return "AVOID"
-
-def get_outlook(buy_count):
-    if buy_count >= 3:
-        return "BULLISH"
-    elif buy_count >= 2:
-        return "MODERATELY BULLISH"
-    elif buy_count >= 1:
-        return "NEUTRAL"
-    return "BEARISH"
+# (recommendation, outlook) indexed by BUY count 0-4
+verdicts = [
+    ("AVOID", "BEARISH"),
+    ("HOLD", "NEUTRAL"),
+    ("BUY", "MODERATELY BULLISH"),
+    ("STRONG BUY", "BULLISH"),
+    ("STRONG BUY", "BULLISH"),
+]
 
 # Build report
-report = "# Market Scanner Report\\n\\n"
-report += "## Executive Summary\\n\\n"
-report += f"Scanned {{len(stocks)}} stocks using four technical strategies.\\n\\n"
-report += f"**Stocks Analyzed:** {{', '.join(stocks)}}\\n\\n"
-report += f"**Analysis Period:** {{period}}\\n\\n"
-report += "---\\n\\n"
-
-report += "## Stock Rankings Summary Table\\n\\n"
-report += "| Rank | Symbol | BUY Signals | Overall Signal | Recommendation |\\n"
-report += "|------|--------|-------------|----------------|----------------|\\n"
+parts = []
+parts.append("# Market Scanner Report\\n\\n")
+parts.append("## Executive Summary\\n\\n")
+parts.append(f"Scanned {{len(stocks)}} stocks using four technical strategies.\\n\\n")
+parts.append(f"**Stocks Analyzed:** {{', '.join(stocks)}}\\n\\n")
+parts.append(f"**Analysis Period:** {{period}}\\n\\n")
+parts.append("---\\n\\n")
+
+parts.append("## Stock Rankings Summary Table\\n\\n")
+parts.append("| Rank | Symbol | BUY Signals | Overall Signal | Recommendation |\\n")
+parts.append("|------|--------|-------------|----------------|----------------|\\n")
 for i, (stock, data) in enumerate(ranked, 1):
-    rec = get_recommendation(data["buy_count"])
-    outlook = get_outlook(data["buy_count"])
-    report += f"| {{i}} | **{{stock}}** | {{data['buy_count']}}/4 | {{outlook}} | {{rec}} |\\n"
-report += "\\n---\\n\\n"
+    rec, outlook = verdicts[data["buy_count"]]
+    parts.append(f"| {{i}} | **{{stock}}** | {{data['buy_count']}}/4 | {{outlook}} | {{rec}} |\\n")
+parts.append("\\n---\\n\\n")
 
-report += "## Detailed Stock Analysis\\n\\n"
+parts.append("## Detailed Stock Analysis\\n\\n")
 medals = ["🥇", "🥈", "🥉"]
 for i, (stock, data) in enumerate(ranked, 1):
     medal = medals[i-1] if i <= 3 else ""
-    report += f"### {{medal}} Rank {{i}}: {{stock}}\\n\\n"
-    report += "**Signal Breakdown:**\\n\\n"
-    report += "| Strategy | Signal |\\n"
-    report += "|----------|--------|\\n"
-    report += f"| Bollinger-Fibonacci | {{data['bb_signal']}} |\\n"
-    report += f"| MACD-Donchian | {{data['macd_signal']}} |\\n"
-    report += f"| Connors RSI-ZScore | {{data['connors_signal']}} |\\n"
-    report += f"| Dual Moving Average | {{data['dual_ma_signal']}} |\\n\\n"
-    report += f"**Verdict:** {{data['buy_count']}}/4 BUY signals - {{get_recommendation(data['buy_count'])}}\\n\\n"
-    report += "---\\n\\n"
+    parts.append(f"### {{medal}} Rank {{i}}: {{stock}}\\n\\n")
+    parts.append("**Signal Breakdown:**\\n\\n")
+    parts.append("| Strategy | Signal |\\n")
+    parts.append("|----------|--------|\\n")
+    parts.append(f"| Bollinger-Fibonacci | {{data['bb_signal']}} |\\n")
+    parts.append(f"| MACD-Donchian | {{data['macd_signal']}} |\\n")
+    parts.append(f"| Connors RSI-ZScore | {{data['connors_signal']}} |\\n")
+    parts.append(f"| Dual Moving Average | {{data['dual_ma_signal']}} |\\n\\n")
+    parts.append(f"**Verdict:** {{data['buy_count']}}/4 BUY signals - {{verdicts[data['buy_count']][0]}}\\n\\n")
+    parts.append("---\\n\\n")
 
 # Top picks and avoid
 top_picks = [(s, d) for s, d in ranked if d["buy_count"] >= 3]
 to_avoid = [(s, d) for s, d in ranked if d["buy_count"] == 0]
 
-report += "## 🎯 TOP PICKS\\n\\n"
-report += "### Best Opportunities (3+ BUY signals):\\n\\n"
+parts.append("## 🎯 TOP PICKS\\n\\n")
+parts.append("### Best Opportunities (3+ BUY signals):\\n\\n")
 if top_picks:
     for i, (stock, data) in enumerate(top_picks, 1):
-        report += f"{{i}}. **{{stock}}** - {{data['buy_count']}}/4 BUY signals\\n\\n"
+        parts.append(f"{{i}}. **{{stock}}** - {{data['buy_count']}}/4 BUY signals\\n\\n")
 else:
-    report += "No stocks with 3+ BUY signals in this scan.\\n\\n"
+    parts.append("No stocks with 3+ BUY signals in this scan.\\n\\n")
 
-report += "### Stocks to Avoid (0 BUY signals):\\n\\n"
+parts.append("### Stocks to Avoid (0 BUY signals):\\n\\n")
 if to_avoid:
     for i, (stock, data) in enumerate(to_avoid, 1):
-        report += f"{{i}}. **{{stock}}** - 0/4 BUY signals\\n\\n"
+        parts.append(f"{{i}}. **{{stock}}** - 0/4 BUY signals\\n\\n")
 else:
-    report += "No stocks with 0 BUY signals in this scan.\\n\\n"
+    parts.append("No stocks with 0 BUY signals in this scan.\\n\\n")
 
-report += "---\\n\\n"
-report += "## Market Sentiment\\n\\n"
+parts.append("---\\n\\n")
+parts.append("## Market Sentiment\\n\\n")
 total_buy = sum(d["buy_count"] for d in stock_summaries.values())
 avg_buy = total_buy / len(stocks)
 sentiment = "BULLISH" if avg_buy >= 2 else "NEUTRAL" if avg_buy >= 1 else "BEARISH"
-report += f"- **Average BUY Signals:** {{avg_buy:.1f}}/4 across all stocks\\n\\n"
-report += f"- **Market Outlook:** {{sentiment}}\\n\\n"
-report += "\\n**Disclaimer:** This analysis is for educational purposes only.\\n\\n"
+parts.append(f"- **Average BUY Signals:** {{avg_buy:.1f}}/4 across all stocks\\n\\n")
+parts.append(f"- **Market Outlook:** {{sentiment}}\\n\\n")
+parts.append("\\n**Disclaimer:** This analysis is for educational purposes only.\\n\\n")
 
+report = "".join(parts)
 final_answer(report)
 ```
 
@@ -512,54 +749,46 @@ REQUIREMENTS:
 2. Use markdown tables for rankings
 3. Include medals (🥇, 🥈, 🥉) for top 3
 4. Show top picks and stocks to avoid
+5. Build the report with parts.append(...) and "".join(parts), not report += in loops (O(N) instead of O(N^2))
 """
 
 FUNDAMENTAL_ANALYSIS_PROMPT = """Analyze {symbol} fundamentals.
 
-TOOL TO CALL:
-fundamental_analysis_report(symbol="{symbol}", period="{period}")
+Call graded_fundamental_report(symbol="{symbol}", period="{period}") ONCE. It returns
+'assessment', 'health' and 'grade' (already computed - copy them exactly) and 'report'
+(the fundamental analysis text). Then give the final answer as a markdown report in
+this format:
 
-```python
-import re
+# {symbol} Fundamental Analysis Report
 
-fund_data = fundamental_analysis_report(symbol="{symbol}", period="{period}")
-
-# Determine assessment
-if "STRONG" in fund_data.upper() and "BUY" in fund_data.upper():
-    assessment = "STRONG BUY"
-    health = "STRONG"
-    grade = "A"
-elif "BUY" in fund_data.upper():
-    assessment = "BUY"
-    health = "GOOD"
-    grade = "B"
-elif "SELL" in fund_data.upper():
-    assessment = "SELL"
-    health = "WEAK"
-    grade = "D"
-else:
-    assessment = "HOLD"
-    health = "MODERATE"
-    grade = "C"
-
-report = "# {symbol} Fundamental Analysis Report\\n\\n"
-report += "## Executive Summary\\n\\n"
-report += "**Company:** {symbol}\\n\\n"
-report += "**Analysis Period:** {period}\\n\\n"
-report += f"**Financial Health:** {{health}}\\n\\n"
-report += f"**Investment Grade:** {{grade}}\\n\\n"
-report += "---\\n\\n"
-
-report += "## Financial Data\\n\\n"
-report += f"{{fund_data}}\\n\\n"
-report += "---\\n\\n"
-
-report += f"## 🎯 RECOMMENDATION: **{{assessment}}**\\n\\n"
-report += f"**Rationale:** Based on the fundamental analysis, {symbol} shows {{health.lower()}} financial health with an investment grade of {{grade}}.\\n\\n"
-report += "**Disclaimer:** This analysis is for educational purposes only.\\n\\n"
+## Executive Summary
 
-final_answer(report)
-```
+**Company:** {symbol}
+
+**Analysis Period:** {period}
+
+**Financial Health:** [health]
+
+**Investment Grade:** [grade]
+
+---
+
+## Key Financial Data
+
+[Quote only the figures from 'report' that support the rationale, as a short
+markdown table - do not reproduce the whole report]
+
+---
+
+## 🎯 RECOMMENDATION: **[assessment]**
+
+**Rationale:** Based on the fundamental analysis, {symbol} shows [health in lower case] financial health with an investment grade of [grade].
+
+**Disclaimer:** This analysis is for educational purposes only.
+
+REQUIREMENTS:
+1. Use only data returned by the tool
+2. Use USD for currency (no dollar signs)
 """
 
 MULTI_SECTOR_PROMPT = """Analyze multiple sectors using individual strategy tools.
@@ -568,96 +797,57 @@ MULTI_SECTOR_PROMPT = """Analyze multiple sectors using individual strategy tool
 
 Period: {period}
 
+TOOLS TO CALL:
+1. scan_symbols(symbols, period) - ONE call for every unique stock (symbols shared by
+   several sectors are listed once); returns {{symbol: {{"bollinger_fib", "macd_donchian", "connors_zscore", "dual_ma"}}}}
+2. parse_signal(text) - current BUY/SELL/HOLD signal of one strategy output
+
 ```python
 from datetime import datetime
 
 sectors = {sectors_dict}
+unique_symbols = {unique_symbols}
 period = "{period}"
 
-def extract_current_signal(tool_output):
-    \"\"\"
-    Extract the CURRENT signal from tool output using simple string matching.
-    The tool outputs contain 'Current Signal: BUY/SELL/HOLD' in the CURRENT STATUS section.
-    \"\"\"
-    text = tool_output.upper()
-    
-    # Method 1: Direct string matching for the exact patterns from tool output
-    # Tools output format: "• Current Signal: BUY" or "Current Signal: SELL"
-    if "CURRENT SIGNAL: BUY" in text:
-        return "BUY"
-    if "CURRENT SIGNAL: SELL" in text:
-        return "SELL"
-    if "CURRENT SIGNAL: HOLD" in text:
-        return "HOLD"
-    
-    # Method 2: Look for "Enter Long Position" or "Enter Short Position"
-    # Tools output: "Strategy Recommendation: Enter Long Position"
-    if "ENTER LONG" in text:
-        return "BUY"
-    if "ENTER SHORT" in text:
-        return "SELL"
-    
-    # Method 3: Look for signal interpretations
-    # Some tools output: "SIGNAL: Strong Buy Signal" or "Trading Signal: Buy Signal"
-    if "STRONG BUY" in text or "BUY SIGNAL" in text:
-        return "BUY"
-    if "STRONG SELL" in text or "SELL SIGNAL" in text:
-        return "SELL"
-    
-    # Method 4: Check the LAST section for signal keywords
-    # Split into sections and check the last part
-    last_section = text[-500:] if len(text) > 500 else text
-    
-    # Count BUY/SELL occurrences in the last section (where current signal is)
-    buy_count = last_section.count("BUY")
-    sell_count = last_section.count("SELL")
-    
-    # If clear winner in the last section
-    if buy_count > sell_count and buy_count >= 2:
-        return "BUY"
-    if sell_count > buy_count and sell_count >= 2:
-        return "SELL"
-    
-    return "HOLD"
+# Map each stock to every sector that lists it
+symbol_sectors = {{}}
+for sector_name, stocks in sectors.items():
+    for stock in stocks:
+        symbol_sectors.setdefault(stock, []).append(sector_name)
+
+# Collect all stock data: one concurrent call over the de-duplicated symbols
+results = scan_symbols(symbols=unique_symbols, period=period)
 
-# Collect all stock data
 all_stocks_data = {{}}
 sector_summaries = {{}}
-total_stocks = 0
 
-for sector_name, symbols_str in sectors.items():
-    stocks = [s.strip() for s in symbols_str.split(",") if s.strip()]
+for stock in unique_symbols:
+    stock_results = results[stock]
     
-    for stock in stocks:
-        # Call all 4 strategy tools
-        bb_result = bollinger_fibonacci_analysis(symbol=stock, period=period)
-        macd_result = macd_donchian_analysis(symbol=stock, period=period)
-        connors_result = connors_zscore_analysis(symbol=stock, period=period)
-        dual_ma_result = dual_moving_average_analysis(symbol=stock, period=period)
-        
-        # Extract signals using the improved parser
-        bb_signal = extract_current_signal(bb_result)
-        macd_signal = extract_current_signal(macd_result)
-        connors_signal = extract_current_signal(connors_result)
-        dual_ma_signal = extract_current_signal(dual_ma_result)
-        
-        # Count BUY signals
-        signals = [bb_signal, macd_signal, connors_signal, dual_ma_signal]
-        buy_count = sum(1 for s in signals if s == "BUY")
-        
-        all_stocks_data[stock] = {{
-            "sector": sector_name,
-            "buy_count": buy_count,
-            "bb": bb_signal,
-            "macd": macd_signal,
-            "connors": connors_signal,
-            "dual_ma": dual_ma_signal
-        }}
-        total_stocks += 1
+    # Extract signals with the parse_signal tool (one scan per output)
+    bb_signal = parse_signal(text=stock_results["bollinger_fib"])
+    macd_signal = parse_signal(text=stock_results["macd_donchian"])
+    connors_signal = parse_signal(text=stock_results["connors_zscore"])
+    dual_ma_signal = parse_signal(text=stock_results["dual_ma"])
+    
+    # Count BUY signals
+    signals = [bb_signal, macd_signal, connors_signal, dual_ma_signal]
+    buy_count = sum(1 for s in signals if s == "BUY")
+    
+    all_stocks_data[stock] = {{
+        "sector": symbol_sectors[stock][0],
+        "sectors": symbol_sectors[stock],
+        "buy_count": buy_count,
+        "bb": bb_signal,
+        "macd": macd_signal,
+        "connors": connors_signal,
+        "dual_ma": dual_ma_signal
+    }}
+
+total_stocks = len(unique_symbols)
 
 # Calculate sector summaries
-for sector_name, symbols_str in sectors.items():
-    stocks = [s.strip() for s in symbols_str.split(",") if s.strip()]
+for sector_name, stocks in sectors.items():
     sector_stocks = [all_stocks_data[s] for s in stocks if s in all_stocks_data]
     
     if sector_stocks:
@@ -694,243 +884,212 @@ priority_picks = [(s, sec, c, d) for s, sec, c, d in all_stocks_ranked if c >= 3
 secondary_picks = [(s, sec, c, d) for s, sec, c, d in all_stocks_ranked if c == 2]
 avoid_list = [(s, sec, c, d) for s, sec, c, d in all_stocks_ranked if c <= 1]
 
-# Build comprehensive report
-report = "# Multi-Sector Market Analysis Report\\n\\n"
-report += f"**Analysis Date:** {{datetime.now().strftime('%B %d, %Y')}}\\n"
-report += f"**Period:** {{period}} | **Total Stocks Analyzed:** {{total_stocks}} | **Sectors:** {{len(sectors)}}\\n\\n"
-report += "---\\n\\n"
+# Build comprehensive report: static runs are emitted as one append each
+parts = []
+parts.append(
+    "# Multi-Sector Market Analysis Report\\n\\n"
+    f"**Analysis Date:** {{datetime.now().strftime('%B %d, %Y')}}\\n"
+    f"**Period:** {{period}} | **Total Stocks Analyzed:** {{total_stocks}} | **Sectors:** {{len(sectors)}}\\n\\n"
+    "---\\n\\n"
+)
 
 # Executive Summary
-report += "## 📊 Executive Summary\\n\\n"
-report += "### Cross-Sector Performance Overview\\n\\n"
-report += "| Sector | Stocks | Avg BUY Signals | Success Rate | Best Stock | Outlook |\\n"
-report += "|--------|--------|-----------------|--------------|------------|---------|\\n"
+parts.append(
+    "## 📊 Executive Summary\\n\\n"
+    "### Cross-Sector Performance Overview\\n\\n"
+    "| Sector | Stocks | Avg BUY Signals | Success Rate | Best Stock | Outlook |\\n"
+    "|--------|--------|-----------------|--------------|------------|---------|\\n"
+)
 for sector, data in ranked_sectors:
-    report += f"| **{{sector}}** | {{data['stock_count']}} | {{data['avg']:.1f}}/4 | {{data['success_rate']:.0f}}% | {{data['best_stock']}} | {{data['outlook']}} |\\n"
-report += f"| **OVERALL** | **{{total_stocks}}** | **{{overall_avg:.1f}}/4** | **{{overall_success:.0f}}%** | - | - |\\n\\n"
+    parts.append(f"| **{{sector}}** | {{data['stock_count']}} | {{data['avg']:.1f}}/4 | {{data['success_rate']:.0f}}% | {{data['best_stock']}} | {{data['outlook']}} |\\n")
+parts.append(f"| **OVERALL** | **{{total_stocks}}** | **{{overall_avg:.1f}}/4** | **{{overall_success:.0f}}%** | - | - |\\n\\n")
 
 # Key insights
-report += "### Key Market Insights\\n\\n"
+parts.append("### Key Market Insights\\n\\n")
 if overall_avg >= 2:
-    report += "🟢 **Bullish Technical Environment**: Multiple sectors showing strong buy signals\\n"
+    parts.append("🟢 **Bullish Technical Environment**: Multiple sectors showing strong buy signals\\n")
 elif overall_avg >= 1:
-    report += "🟡 **Mixed Technical Environment**: Selective opportunities across sectors\\n"
+    parts.append("🟡 **Mixed Technical Environment**: Selective opportunities across sectors\\n")
 else:
-    report += "🔴 **Bearish Technical Environment**: Limited technical opportunities\\n"
-report += f"🏆 **Sector Leadership**: {{ranked_sectors[0][0]}} shows strongest technical signals\\n"
-report += f"💡 **Opportunities Identified**: {{len(priority_picks)}} priority + {{len(secondary_picks)}} secondary picks\\n"
-report += f"⚠️ **Stocks to Avoid**: {{len(avoid_list)}} stocks with weak signals\\n\\n"
-report += "---\\n\\n"
+    parts.append("🔴 **Bearish Technical Environment**: Limited technical opportunities\\n")
+parts.append(
+    f"🏆 **Sector Leadership**: {{ranked_sectors[0][0]}} shows strongest technical signals\\n"
+    f"💡 **Opportunities Identified**: {{len(priority_picks)}} priority + {{len(secondary_picks)}} secondary picks\\n"
+    f"⚠️ **Stocks to Avoid**: {{len(avoid_list)}} stocks with weak signals\\n\\n"
+    "---\\n\\n"
+)
 
 # Investment Recommendations
-report += "## 🎯 Final Investment Recommendations\\n\\n"
+parts.append("## 🎯 Final Investment Recommendations\\n\\n")
 
 if priority_picks:
-    report += f"### 🟢 PRIORITY INVESTMENTS ({{len(priority_picks)}} Stocks)\\n\\n"
+    parts.append(f"### 🟢 PRIORITY INVESTMENTS ({{len(priority_picks)}} Stocks)\\n\\n")
     for i, (stock, sector, buy_count, data) in enumerate(priority_picks[:5], 1):
         risk = "Low" if buy_count == 4 else "Medium"
         position = "3-5%" if buy_count == 4 else "2-3%"
-        report += f"#### {{i}}. {{stock}} | {{sector}}\\n"
-        report += f"**🎯 STRONG BUY | 📊 HIGH CONFIDENCE | 💰 {{position}} POSITION**\\n\\n"
-        report += f"- **BUY Signals**: {{buy_count}}/4 strategies\\n"
-        report += f"- **Signal Breakdown**: BB={{data['bb']}}, MACD={{data['macd']}}, Connors={{data['connors']}}, DualMA={{data['dual_ma']}}\\n"
-        report += f"- **Risk Level**: {{risk}}\\n\\n"
+        parts.append(
+            f"#### {{i}}. {{stock}} | {{sector}}\\n"
+            f"**🎯 STRONG BUY | 📊 HIGH CONFIDENCE | 💰 {{position}} POSITION**\\n\\n"
+            f"- **BUY Signals**: {{buy_count}}/4 strategies\\n"
+            f"- **Signal Breakdown**: BB={{data['bb']}}, MACD={{data['macd']}}, Connors={{data['connors']}}, DualMA={{data['dual_ma']}}\\n"
+            f"- **Risk Level**: {{risk}}\\n\\n"
+        )
 else:
-    report += "### 🟢 PRIORITY INVESTMENTS\\n\\n"
-    report += "No stocks with 3+ BUY signals identified in this scan.\\n\\n"
+    parts.append(
+        "### 🟢 PRIORITY INVESTMENTS\\n\\n"
+        "No stocks with 3+ BUY signals identified in this scan.\\n\\n"
+    )
 
 if secondary_picks:
-    report += f"### 🔵 SECONDARY OPPORTUNITIES ({{len(secondary_picks)}} Stocks)\\n\\n"
+    parts.append(f"### 🔵 SECONDARY OPPORTUNITIES ({{len(secondary_picks)}} Stocks)\\n\\n")
     for i, (stock, sector, buy_count, data) in enumerate(secondary_picks[:5], 1):
-        report += f"#### {{stock}} | {{sector}}\\n"
-        report += f"**🎯 BUY | 📊 MEDIUM CONFIDENCE | 💰 1-2% POSITION**\\n\\n"
-        report += f"- **BUY Signals**: {{buy_count}}/4 strategies\\n"
-        report += f"- **Signal Breakdown**: BB={{data['bb']}}, MACD={{data['macd']}}, Connors={{data['connors']}}, DualMA={{data['dual_ma']}}\\n\\n"
+        parts.append(
+            f"#### {{stock}} | {{sector}}\\n"
+            "**🎯 BUY | 📊 MEDIUM CONFIDENCE | 💰 1-2% POSITION**\\n\\n"
+            f"- **BUY Signals**: {{buy_count}}/4 strategies\\n"
+            f"- **Signal Breakdown**: BB={{data['bb']}}, MACD={{data['macd']}}, Connors={{data['connors']}}, DualMA={{data['dual_ma']}}\\n\\n"
+        )
 else:
-    report += "### 🔵 SECONDARY OPPORTUNITIES\\n\\n"
-    report += "No stocks with exactly 2 BUY signals identified.\\n\\n"
+    parts.append(
+        "### 🔵 SECONDARY OPPORTUNITIES\\n\\n"
+        "No stocks with exactly 2 BUY signals identified.\\n\\n"
+    )
 
-report += "---\\n\\n"
+parts.append("---\\n\\n")
 
 # Sector-by-Sector Analysis
-report += "## 📈 Sector-by-Sector Analysis\\n\\n"
+parts.append("## 📈 Sector-by-Sector Analysis\\n\\n")
 sector_emojis = ["🏦", "💻", "⚡", "🏥", "🛒", "🏭"]
 for i, (sector, data) in enumerate(ranked_sectors):
     emoji = sector_emojis[i % len(sector_emojis)]
-    report += f"### {{emoji}} {{sector}}\\n"
-    report += f"**Performance**: {{data['avg']:.1f}}/4 avg BUY signals | {{data['success_rate']:.0f}}% success rate\\n\\n"
+    parts.append(
+        f"### {{emoji}} {{sector}}\\n"
+        f"**Performance**: {{data['avg']:.1f}}/4 avg BUY signals | {{data['success_rate']:.0f}}% success rate\\n\\n"
+    )
     
-    sector_stocks = [(s, d) for s, sec, c, d in all_stocks_ranked if sec == sector]
+    sector_stocks = [(s, d) for s, sec, c, d in all_stocks_ranked if sector in d["sectors"]]
     top_picks = [(s, d) for s, d in sector_stocks if d["buy_count"] >= 2]
     avoid = [s for s, d in sector_stocks if d["buy_count"] <= 1]
     
-    report += "**Top Picks**:\\n"
+    parts.append("**Top Picks**:\\n")
     if top_picks:
         for stock, d in top_picks[:3]:
-            report += f"- **{{stock}}** - {{d['buy_count']}}/4 BUY signals\\n"
+            parts.append(f"- **{{stock}}** - {{d['buy_count']}}/4 BUY signals\\n")
     else:
-        report += "- No strong picks in this sector\\n"
-    report += "\\n"
+        parts.append("- No strong picks in this sector\\n")
+    parts.append("\\n")
     
     if avoid:
-        report += f"**Avoid**: {{', '.join(avoid)}}\\n\\n"
+        parts.append(f"**Avoid**: {{', '.join(avoid)}}\\n\\n")
     
-    report += "---\\n\\n"
+    parts.append("---\\n\\n")
 
 # Strategy Effectiveness
-report += "## 📬 Strategy Effectiveness Analysis\\n\\n"
-report += "| Strategy | BUY Signals | SELL Signals | HOLD Signals |\\n"
-report += "|----------|-------------|--------------|--------------|\\n"
-
-bb_buys = sum(1 for s, sec, c, d in all_stocks_ranked if d["bb"] == "BUY")
-bb_sells = sum(1 for s, sec, c, d in all_stocks_ranked if d["bb"] == "SELL")
-bb_holds = total_stocks - bb_buys - bb_sells
-
-macd_buys = sum(1 for s, sec, c, d in all_stocks_ranked if d["macd"] == "BUY")
-macd_sells = sum(1 for s, sec, c, d in all_stocks_ranked if d["macd"] == "SELL")
-macd_holds = total_stocks - macd_buys - macd_sells
-
-connors_buys = sum(1 for s, sec, c, d in all_stocks_ranked if d["connors"] == "BUY")
-connors_sells = sum(1 for s, sec, c, d in all_stocks_ranked if d["connors"] == "SELL")
-connors_holds = total_stocks - connors_buys - connors_sells
-
-dual_ma_buys = sum(1 for s, sec, c, d in all_stocks_ranked if d["dual_ma"] == "BUY")
-dual_ma_sells = sum(1 for s, sec, c, d in all_stocks_ranked if d["dual_ma"] == "SELL")
-dual_ma_holds = total_stocks - dual_ma_buys - dual_ma_sells
+parts.append(
+    "## 📬 Strategy Effectiveness Analysis\\n\\n"
+    "| Strategy | BUY Signals | SELL Signals | HOLD Signals |\\n"
+    "|----------|-------------|--------------|--------------|\\n"
+)
 
-report += f"| Bollinger-Fibonacci | {{bb_buys}}/{{total_stocks}} | {{bb_sells}}/{{total_stocks}} | {{bb_holds}}/{{total_stocks}} |\\n"
-report += f"| MACD-Donchian | {{macd_buys}}/{{total_stocks}} | {{macd_sells}}/{{total_stocks}} | {{macd_holds}}/{{total_stocks}} |\\n"
-report += f"| Connors RSI-ZScore | {{connors_buys}}/{{total_stocks}} | {{connors_sells}}/{{total_stocks}} | {{connors_holds}}/{{total_stocks}} |\\n"
-report += f"| Dual Moving Average | {{dual_ma_buys}}/{{total_stocks}} | {{dual_ma_sells}}/{{total_stocks}} | {{dual_ma_holds}}/{{total_stocks}} |\\n\\n"
+# Tally every strategy's signals in one pass over the ranked stocks
+strategy_counts = {{key: {{"BUY": 0, "SELL": 0, "HOLD": 0}} for key in ("bb", "macd", "connors", "dual_ma")}}
+for s, sec, c, d in all_stocks_ranked:
+    for key, counts in strategy_counts.items():
+        counts[d[key]] += 1
 
-report += "---\\n\\n"
+strategy_labels = [("bb", "Bollinger-Fibonacci"), ("macd", "MACD-Donchian"), ("connors", "Connors RSI-ZScore"), ("dual_ma", "Dual Moving Average")]
+for key, label in strategy_labels:
+    buys = strategy_counts[key]["BUY"]
+    sells = strategy_counts[key]["SELL"]
+    holds = total_stocks - buys - sells
+    parts.append(f"| {{label}} | {{buys}}/{{total_stocks}} | {{sells}}/{{total_stocks}} | {{holds}}/{{total_stocks}} |\\n")
+parts.append("\\n---\\n\\n")
 
 # Portfolio Construction
-report += "## 🎯 Portfolio Construction Framework\\n\\n"
-report += "### Recommended Allocation\\n\\n"
+parts.append(
+    "## 🎯 Portfolio Construction Framework\\n\\n"
+    "### Recommended Allocation\\n\\n"
+)
 if len(priority_picks) >= 2:
-    report += "**AGGRESSIVE APPROACH**:\\n"
-    report += "- 60% in Priority Picks (distributed)\\n"
-    report += "- 25% in Secondary Opportunities\\n"
-    report += "- 15% Cash/Defensive\\n\\n"
+    parts.append(
+        "**AGGRESSIVE APPROACH**:\\n"
+        "- 60% in Priority Picks (distributed)\\n"
+        "- 25% in Secondary Opportunities\\n"
+        "- 15% Cash/Defensive\\n\\n"
+    )
 else:
-    report += "**CONSERVATIVE APPROACH** (Recommended):\\n"
-    report += "- 40% Cash/Fixed Income (defensive)\\n"
-    report += f"- 35% {{ranked_sectors[0][0]}} exposure\\n"
-    report += "- 25% Selective stock picks\\n\\n"
-
-report += "### Risk Management\\n\\n"
-report += "- **Maximum single position**: 5%\\n"
-report += "- **Sector exposure limit**: 30%\\n"
-report += "- **Stop loss**: 8-10% below entry\\n\\n"
+    parts.append(
+        "**CONSERVATIVE APPROACH** (Recommended):\\n"
+        "- 40% Cash/Fixed Income (defensive)\\n"
+        f"- 35% {{ranked_sectors[0][0]}} exposure\\n"
+        "- 25% Selective stock picks\\n\\n"
+    )
 
-report += "---\\n\\n"
+parts.append(
+    "### Risk Management\\n\\n"
+    "- **Maximum single position**: 5%\\n"
+    "- **Sector exposure limit**: 30%\\n"
+    "- **Stop loss**: 8-10% below entry\\n\\n"
+    "---\\n\\n"
+)
 
 # Appendix
-report += "## 📊 Appendix: Complete Holdings Summary\\n\\n"
-report += "### ALL ANALYZED STOCKS\\n\\n"
-report += "| Symbol | Sector | BUY Signals | Action | BB | MACD | Connors | DualMA |\\n"
-report += "|--------|--------|-------------|--------|-----|------|---------|--------|\\n"
-for stock, sector, buy_count, data in all_stocks_ranked:
-    action = "STRONG BUY" if buy_count >= 3 else "BUY" if buy_count == 2 else "HOLD" if buy_count == 1 else "AVOID"
-    report += f"| {{stock}} | {{sector}} | {{buy_count}}/4 | {{action}} | {{data['bb']}} | {{data['macd']}} | {{data['connors']}} | {{data['dual_ma']}} |\\n"
-
-report += "\\n---\\n\\n"
-report += "*This analysis uses 4 individual strategy tools with improved signal parsing. Past performance does not guarantee future results.*\\n"
+parts.append(
+    "## 📊 Appendix: Complete Holdings Summary\\n\\n"
+    "### ALL ANALYZED STOCKS\\n\\n"
+    "| Symbol | Sector | BUY Signals | Action | BB | MACD | Connors | DualMA |\\n"
+    "|--------|--------|-------------|--------|-----|------|---------|--------|\\n"
+)
+actions = ["AVOID", "HOLD", "BUY", "STRONG BUY", "STRONG BUY"]  # indexed by BUY count 0-4
+appendix_limit = 50  # keep large scans from bloating the final answer
+for stock, sector, buy_count, data in all_stocks_ranked[:appendix_limit]:
+    action = actions[buy_count]
+    parts.append(f"| {{stock}} | {{sector}} | {{buy_count}}/4 | {{action}} | {{data['bb']}} | {{data['macd']}} | {{data['connors']}} | {{data['dual_ma']}} |\\n")
+if total_stocks > appendix_limit:
+    parts.append(f"| ... | {{total_stocks - appendix_limit}} more stocks with weaker signals | | | | | | |\\n")
+
+parts.append(
+    "\\n---\\n\\n"
+    "*This analysis uses 4 individual strategy tools with improved signal parsing. Past performance does not guarantee future results.*\\n"
+)
 
+report = "".join(parts)
 final_answer(report)
 ```
+
+REQUIREMENTS:
+1. Build the report with parts.append(...) and "".join(parts), not report += in loops (O(N) instead of O(N^2))
 """
 
 COMBINED_ANALYSIS_PROMPT = """Perform complete Technical + Fundamental analysis of {symbol}.
 
-TOOLS TO CALL:
-1. bollinger_fibonacci_analysis(symbol="{symbol}", period="{technical_period}")
-2. macd_donchian_analysis(symbol="{symbol}", period="{technical_period}")
-3. connors_zscore_analysis(symbol="{symbol}", period="{technical_period}")
-4. dual_moving_average_analysis(symbol="{symbol}", period="{technical_period}")
-5. fundamental_analysis_report(symbol="{symbol}", period="{fundamental_period}")
+TOOL TO CALL (once):
+combined_analysis(symbol="{symbol}", technical_period="{technical_period}", fundamental_period="{fundamental_period}")
+- runs all 4 strategies and the fundamental report concurrently
+Use parse_signal(text=...) to read each strategy's current BUY/SELL/HOLD signal and
+parse_fundamental_outlook(text=...) for the POSITIVE/NEGATIVE/NEUTRAL fundamental outlook.
+
+`report_template` is already defined in your Python environment: fill it with .format(...).
 
 ```python
 symbol = "{symbol}"
 tech_period = "{technical_period}"
 fund_period = "{fundamental_period}"
 
-# Get technical analysis
-bb_result = bollinger_fibonacci_analysis(symbol=symbol, period=tech_period)
-macd_result = macd_donchian_analysis(symbol=symbol, period=tech_period)
-connors_result = connors_zscore_analysis(symbol=symbol, period=tech_period)
-dual_ma_result = dual_moving_average_analysis(symbol=symbol, period=tech_period)
-
-# Get fundamental analysis
-fund_result = fundamental_analysis_report(symbol=symbol, period=fund_period)
-
-def extract_signal(tool_output):
-    \"\"\"Extract the CURRENT signal using simple string matching.\"\"\"
-    text = tool_output.upper()
-    
-    # Direct pattern matching for "Current Signal: X"
-    if "CURRENT SIGNAL: BUY" in text:
-        return "BUY"
-    if "CURRENT SIGNAL: SELL" in text:
-        return "SELL"
-    if "CURRENT SIGNAL: HOLD" in text:
-        return "HOLD"
-    
-    # Look for recommendation patterns
-    if "ENTER LONG" in text:
-        return "BUY"
-    if "ENTER SHORT" in text:
-        return "SELL"
-    
-    # Look for signal interpretations
-    if "STRONG BUY" in text or "BUY SIGNAL" in text:
-        return "BUY"
-    if "STRONG SELL" in text or "SELL SIGNAL" in text:
-        return "SELL"
-    
-    # Fallback: count BUY/SELL in last section
-    last_section = text[-500:] if len(text) > 500 else text
-    buy_count = last_section.count("BUY")
-    sell_count = last_section.count("SELL")
-    
-    if buy_count > sell_count and buy_count >= 2:
-        return "BUY"
-    if sell_count > buy_count and sell_count >= 2:
-        return "SELL"
-    
-    return "HOLD"
-
-def get_fund_outlook(fund_text):
-    \"\"\"Determine fundamental outlook from the report.\"\"\"
-    text = fund_text.upper()
-    
-    # Check for explicit recommendations
-    if "STRONG BUY" in text or "INVESTMENT GRADE: A" in text:
-        return "POSITIVE"
-    if "STRONG SELL" in text or "INVESTMENT GRADE: F" in text or "INVESTMENT GRADE: D" in text:
-        return "NEGATIVE"
-    if "FINANCIAL HEALTH: STRONG" in text or "HEALTH: STRONG" in text:
-        return "POSITIVE"
-    if "FINANCIAL HEALTH: WEAK" in text or "HEALTH: WEAK" in text:
-        return "NEGATIVE"
-    
-    # Count positive vs negative indicators
-    positive_indicators = text.count("STRONG") + text.count("GOOD") + text.count("POSITIVE") + text.count("BUY")
-    negative_indicators = text.count("WEAK") + text.count("POOR") + text.count("NEGATIVE") + text.count("SELL") + text.count("CONCERN")
-    
-    if positive_indicators > negative_indicators:
-        return "POSITIVE"
-    elif negative_indicators > positive_indicators:
-        return "NEGATIVE"
-    return "NEUTRAL"
+# Technical + fundamental data in one concurrent call
+data = combined_analysis(symbol=symbol, technical_period=tech_period, fundamental_period=fund_period)
+bb_result = data["technical"]["bollinger_fib"]
+macd_result = data["technical"]["macd_donchian"]
+connors_result = data["technical"]["connors_zscore"]
+dual_ma_result = data["technical"]["dual_ma"]
+fund_result = data["fundamentals"]
 
 # Extract signals
-bb_signal = extract_signal(bb_result)
-macd_signal = extract_signal(macd_result)
-connors_signal = extract_signal(connors_result)
-dual_ma_signal = extract_signal(dual_ma_result)
-fund_outlook = get_fund_outlook(fund_result)
+bb_signal = parse_signal(text=bb_result)
+macd_signal = parse_signal(text=macd_result)
+connors_signal = parse_signal(text=connors_result)
+dual_ma_signal = parse_signal(text=dual_ma_result)
+fund_outlook = parse_fundamental_outlook(text=fund_result)
 
 # Count technical signals
 tech_buy = sum(1 for s in [bb_signal, macd_signal, connors_signal, dual_ma_signal] if s == "BUY")
@@ -979,57 +1138,246 @@ else:
     final_rec = "HOLD"
     confidence = "LOW"
 
-# Build report
-report = f"# {{symbol}} Combined Investment Analysis\\n\\n"
-report += "## Executive Summary\\n\\n"
-report += f"**Symbol:** {{symbol}}\\n\\n"
-report += f"**Technical Period:** {{tech_period}}\\n\\n"
-report += f"**Fundamental Period:** {{fund_period}}\\n\\n"
-report += f"**COMBINED RECOMMENDATION:** {{final_rec}}\\n\\n"
-report += f"**Confidence Level:** {{confidence}}\\n\\n"
-report += f"**Technical/Fundamental Alignment:** {{alignment}} {{align_emoji}}\\n\\n"
-report += "---\\n\\n"
-
-report += "## Technical Analysis Summary\\n\\n"
-report += "### Technical Indicators Table\\n\\n"
-report += "| Strategy | Signal |\\n"
-report += "|----------|--------|\\n"
-report += f"| Bollinger-Fibonacci | {{bb_signal}} |\\n"
-report += f"| MACD-Donchian | {{macd_signal}} |\\n"
-report += f"| Connors RSI-ZScore | {{connors_signal}} |\\n"
-report += f"| Dual Moving Average | {{dual_ma_signal}} |\\n\\n"
-report += f"**Technical Verdict:** {{tech_outlook}} with {{tech_buy}}/4 BUY signals\\n\\n"
-report += "---\\n\\n"
-
-report += "## Fundamental Analysis Summary\\n\\n"
-report += f"{{fund_result}}\\n\\n"
-report += f"**Fundamental Verdict:** {{fund_outlook}}\\n\\n"
-report += "---\\n\\n"
-
-report += "## Alignment Analysis\\n\\n"
-report += "| Aspect | Technical | Fundamental | Alignment |\\n"
-report += "|--------|-----------|-------------|-----------|\\n"
-report += f"| Overall | {{tech_outlook}} | {{fund_outlook}} | {{align_emoji}} |\\n\\n"
-report += f"**Alignment Status:** {{alignment}}\\n\\n"
-report += "---\\n\\n"
-
-report += f"## 🎯 FINAL RECOMMENDATION: **{{final_rec}}**\\n\\n"
-report += "### Why This Recommendation?\\n\\n"
-report += f"**Technical Factors:** {{tech_buy}}/4 strategies show bullish signals\\n\\n"
-report += f"**Fundamental Factors:** Financial analysis shows {{fund_outlook.lower()}} outlook\\n\\n"
-report += f"**Alignment:** Technical and fundamental views are {{alignment.lower()}}\\n\\n"
-report += "---\\n\\n"
-report += "**Disclaimer:** This analysis is for educational purposes only.\\n\\n"
+# Fill the preloaded report_template (do not redefine it)
+report = report_template.format(
+    symbol=symbol, tech_period=tech_period, fund_period=fund_period,
+    final_rec=final_rec, confidence=confidence, alignment=alignment, align_emoji=align_emoji,
+    alignment_lower=alignment.lower(), bb_signal=bb_signal, macd_signal=macd_signal,
+    connors_signal=connors_signal, dual_ma_signal=dual_ma_signal, tech_outlook=tech_outlook,
+    tech_buy=tech_buy, fund_result=fund_result, fund_outlook=fund_outlook,
+    fund_outlook_lower=fund_outlook.lower(),
+)
 
 final_answer(report)
 ```
 """
 
 
+
+# ===========================================================================
+# Precompiled Prompts
+# ===========================================================================
+# The templates are several KB of {{ }}-escaped code. Parse each one once at
+# import into (literal, field) pairs so a run only joins strings.
+
+PromptParts = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _compile_prompt(template: str) -> PromptParts:
+    """Split a str.format template into (literal, field_name) pairs."""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported placeholder in prompt: {{{field}!{conversion}:{spec}}}")
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _render_prompt(parts: PromptParts, **values: Any) -> str:
+    """Render a compiled prompt; equivalent to template.format(**values)."""
+    out = []
+    for literal, field in parts:
+        out.append(literal)
+        if field is not None:
+            out.append(str(values[field]))
+    return "".join(out)
+
+
+_TECHNICAL_PARTS = _compile_prompt(TECHNICAL_ANALYSIS_PROMPT)
+_SCANNER_PARTS = _compile_prompt(MARKET_SCANNER_PROMPT)
+_FUNDAMENTAL_PARTS = _compile_prompt(FUNDAMENTAL_ANALYSIS_PROMPT)
+_MULTI_SECTOR_PARTS = _compile_prompt(MULTI_SECTOR_PROMPT)
+_COMBINED_PARTS = _compile_prompt(COMBINED_ANALYSIS_PROMPT)
+
+
+def _format_sector_details(sectors: Dict[str, str]) -> str:
+    return "\n".join(f"- {name}: {symbols}" for name, symbols in sectors.items())
+
+
+def _plan_sectors(sectors: Dict[str, str]) -> Tuple[Dict[str, list], list]:
+    """Split sector symbol strings and list each symbol once across sectors."""
+    sector_symbols = {name: list(_split_symbols(symbols)) for name, symbols in sectors.items()}
+    unique_symbols = list(dict.fromkeys(s for stocks in sector_symbols.values() for s in stocks))
+    return sector_symbols, unique_symbols
+
+
+@functools.lru_cache(maxsize=64)
+def _build_sector_plan(sectors_frozen: Tuple[Tuple[str, str], ...]) -> Tuple[str, str, str]:
+    """Render the multi-sector prompt inputs once per distinct sectors mapping.
+
+    UI sessions re-run the same sectors across periods and models, so the
+    per-symbol splitting and de-duplication is cached. The mappings are
+    emitted as compact JSON, which is also a valid Python literal and costs
+    fewer prompt tokens than repr().
+    """
+    sectors = dict(sectors_frozen)
+    sector_symbols, unique_symbols = _plan_sectors(sectors)
+    return (
+        _format_sector_details(sectors),
+        json.dumps(sector_symbols, separators=(",", ":")),
+        json.dumps(unique_symbols, separators=(",", ":")),
+    )
+
+
 # ===========================================================================
 # Analysis Functions (Using LOW-LEVEL Tools with Code)
 # ===========================================================================
 
+# Idle agents keyed by (model, tools, executor, agent kind). Building a
+# CodeAgent assembles the system prompt and tool schemas, so agents are
+# reused between runs. An agent is not thread-safe: each run checks one out
+# under the lock and returns it afterwards, so concurrent API requests get
+# separate instances. Pooled agents hold their model, so id(model) stays valid.
+_AGENT_POOL: Dict[tuple, list] = {}
+_AGENT_POOL_LOCK = threading.Lock()
+
+
+def _reset_agent(agent) -> None:
+    """Clear state a previous run left on a pooled agent."""
+    agent.memory.reset()
+    agent.state.clear()
+    executor = getattr(agent, "python_executor", None)
+    executor_state = getattr(executor, "state", None)
+    if isinstance(executor_state, dict):
+        executor_state.clear()
+        executor_state["__name__"] = "__main__"
+    elif hasattr(executor, "run_code_raise_errors"):
+        # Remote (Docker/E2B) kernels keep their globals between runs; run()
+        # sends the tools and variables again after the namespace is cleared.
+        executor.run_code_raise_errors("%reset -f")
+
+
+def _checkout_agent(key: tuple, factory):
+    with _AGENT_POOL_LOCK:
+        idle = _AGENT_POOL.get(key)
+        agent = idle.pop() if idle else None
+    if agent is None:
+        return factory()
+    try:
+        _reset_agent(agent)
+    except Exception:
+        logger.warning("Discarding pooled agent that could not be reset", exc_info=True)
+        _cleanup_agents([agent])
+        return factory()
+    return agent
+
+
+def _checkin_agent(key: tuple, agent) -> None:
+    with _AGENT_POOL_LOCK:
+        _AGENT_POOL.setdefault(key, []).append(agent)
+
+
+def _drop_pooled_agents(model=None) -> None:
+    """Drop the idle agents built on model (all idle agents when None)."""
+    with _AGENT_POOL_LOCK:
+        dropped = [
+            agent
+            for key in [k for k in _AGENT_POOL if model is None or k[0] == id(model)]
+            for agent in _AGENT_POOL.pop(key)
+        ]
+    _cleanup_agents(dropped)
+
+
+atexit.register(_drop_pooled_agents)
+
+
+def _cleanup_agents(agents: list) -> None:
+    """Stop the sandboxes of dropped agents (no-op for local executors)."""
+    for agent in agents:
+        cleanup = getattr(agent, "cleanup", None)
+        if cleanup is not None:
+            cleanup()
+
+
+def _run_streaming(agent, prompt: str, max_steps: int, on_chunk: Callable[[str], None]) -> Any:
+    """Run an agent with stream=True, forwarding output text to on_chunk."""
+    from smolagents.memory import ActionStep, FinalAnswerStep
+    from smolagents.models import ChatMessageStreamDelta
+    
+    result = None
+    for event in agent.run(prompt, stream=True, reset=True, max_steps=max_steps):
+        if isinstance(event, ChatMessageStreamDelta):
+            if event.content:
+                on_chunk(event.content)
+        elif isinstance(event, ActionStep):
+            # Without token streaming the whole step output arrives at once.
+            if isinstance(event.model_output, str) and not getattr(agent, "stream_outputs", False):
+                on_chunk(event.model_output + "\n")
+        elif isinstance(event, FinalAnswerStep):
+            result = event.output
+    return result
+
+
+def _run_agent(
+    prompt: str,
+    *,
+    model_id: str,
+    model_provider: str,
+    openai_api_key: Optional[str],
+    hf_token: Optional[str],
+    openai_base_url: Optional[str],
+    max_steps: int,
+    executor_type: Literal["local", "e2b", "docker"],
+    temperature: float,
+    max_tokens: int,
+    keep_alive: bool = True,
+    tools: Optional[list] = None,
+    tool_calling: bool = False,
+    additional_imports: Tuple[str, ...] = (),
+    variables: Optional[Dict[str, Any]] = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Build the model and CodeAgent, run the prompt and format the result.
+
+    With keep_alive=False the MCP session is shut down after the run;
+    otherwise it stays up for the next call and is closed at exit.
+    When on_chunk is given the agent runs in streaming mode and each piece
+    of model output is passed to it as soon as it is produced. variables are
+    made available to the generated code without being added to the task.
+    """
+    from .tools import LOW_LEVEL_TOOLS, configure_finance_tools, shutdown_finance_tools
+
+    configure_finance_tools()
+    
+    model = build_model(
+        model_id=model_id,
+        provider=model_provider,
+        api_key=openai_api_key,
+        hf_token=hf_token,
+        api_base=openai_base_url,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    
+    tools = LOW_LEVEL_TOOLS if tools is None else tools
+    key = (id(model), tuple(id(t) for t in tools), executor_type, tool_calling, additional_imports)
+    
+    def factory():
+        if tool_calling:
+            return build_tool_calling_agent(model, tools, max_steps=max_steps)
+        return build_agent(
+            model,
+            tools,
+            max_steps=max_steps,
+            executor_type=executor_type,
+            additional_imports=additional_imports,
+        )
+    
+    agent = _checkout_agent(key, factory)
+    if variables:
+        agent.state.update(variables)
+    try:
+        if on_chunk is None:
+            result = agent.run(prompt, reset=True, max_steps=max_steps)
+        else:
+            result = _run_streaming(agent, prompt, max_steps, on_chunk)
+    finally:
+        _checkin_agent(key, agent)
+        if not keep_alive:
+            shutdown_finance_tools()
+    return format_agent_result(result)
+
+
 def run_technical_analysis(
     symbol: str,
     period: str = "1y",
@@ -1042,24 +1390,27 @@ def run_technical_analysis(
     executor_type: Literal["local", "e2b", "docker"] = "local",
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    keep_alive: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> str:
     """Run technical analysis using 4 individual strategy tools."""
-    configure_finance_tools()
-    
-    model = build_model(
+    prompt = _render_prompt(_TECHNICAL_PARTS, symbol=symbol, period=period)
+    return _run_agent(
+        prompt,
         model_id=model_id,
-        provider=model_provider,
-        api_key=openai_api_key,
+        model_provider=model_provider,
+        openai_api_key=openai_api_key,
         hf_token=hf_token,
-        api_base=openai_base_url,
+        openai_base_url=openai_base_url,
+        max_steps=max_steps,
+        executor_type=executor_type,
         temperature=temperature,
         max_tokens=max_tokens,
+        keep_alive=keep_alive,
+        additional_imports=FULL_AGENT_IMPORTS,
+        variables={"report_template": TECHNICAL_REPORT_TEMPLATE},
+        on_chunk=on_chunk,
     )
-    
-    agent = build_agent(model, LOW_LEVEL_TOOLS, max_steps=max_steps, executor_type=executor_type)
-    prompt = TECHNICAL_ANALYSIS_PROMPT.format(symbol=symbol, period=period)
-    result = agent.run(prompt)
-    return format_agent_result(result)
 
 
 def run_market_scanner(
@@ -1074,25 +1425,27 @@ def run_market_scanner(
     executor_type: Literal["local", "e2b", "docker"] = "local",
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    keep_alive: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> str:
     """Run market scanner using loops over individual strategy tools."""
-    configure_finance_tools()
-    
-    model = build_model(
+    symbol_list = list(_split_symbols(symbols))
+    prompt = _render_prompt(_SCANNER_PARTS, symbols=symbols, symbol_list=symbol_list, period=period)
+    return _run_agent(
+        prompt,
         model_id=model_id,
-        provider=model_provider,
-        api_key=openai_api_key,
+        model_provider=model_provider,
+        openai_api_key=openai_api_key,
         hf_token=hf_token,
-        api_base=openai_base_url,
+        openai_base_url=openai_base_url,
+        max_steps=max_steps,
+        executor_type=executor_type,
         temperature=temperature,
         max_tokens=max_tokens,
+        keep_alive=keep_alive,
+        additional_imports=FULL_AGENT_IMPORTS,
+        on_chunk=on_chunk,
     )
-    
-    agent = build_agent(model, LOW_LEVEL_TOOLS, max_steps=max_steps, executor_type=executor_type)
-    symbol_list = [s.strip() for s in symbols.split(",")]
-    prompt = MARKET_SCANNER_PROMPT.format(symbols=symbols, symbol_list=symbol_list, period=period)
-    result = agent.run(prompt)
-    return format_agent_result(result)
 
 
 def run_fundamental_analysis(
@@ -1107,24 +1460,29 @@ def run_fundamental_analysis(
     executor_type: Literal["local", "e2b", "docker"] = "local",
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    keep_alive: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> str:
-    """Run fundamental analysis using fundamental_analysis_report tool."""
-    configure_finance_tools()
-    
-    model = build_model(
+    """Run fundamental analysis with a ToolCallingAgent (single tool, no code step)."""
+    from .tools import graded_fundamental_report
+
+    prompt = _render_prompt(_FUNDAMENTAL_PARTS, symbol=symbol, period=period)
+    return _run_agent(
+        prompt,
         model_id=model_id,
-        provider=model_provider,
-        api_key=openai_api_key,
+        model_provider=model_provider,
+        openai_api_key=openai_api_key,
         hf_token=hf_token,
-        api_base=openai_base_url,
+        openai_base_url=openai_base_url,
+        max_steps=max_steps,
+        executor_type=executor_type,
         temperature=temperature,
         max_tokens=max_tokens,
+        keep_alive=keep_alive,
+        on_chunk=on_chunk,
+        tools=[graded_fundamental_report],
+        tool_calling=True,
     )
-    
-    agent = build_agent(model, LOW_LEVEL_TOOLS, max_steps=max_steps, executor_type=executor_type)
-    prompt = FUNDAMENTAL_ANALYSIS_PROMPT.format(symbol=symbol, period=period)
-    result = agent.run(prompt)
-    return format_agent_result(result)
 
 
 def run_multi_sector_analysis(
@@ -1139,25 +1497,33 @@ def run_multi_sector_analysis(
     executor_type: Literal["local", "e2b", "docker"] = "local",
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    keep_alive: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> str:
     """Run multi-sector analysis using nested loops over tools."""
-    configure_finance_tools()
-    
-    model = build_model(
+    sector_details, sectors_dict, unique_symbols = _build_sector_plan(tuple(sectors.items()))
+    prompt = _render_prompt(
+        _MULTI_SECTOR_PARTS,
+        sector_details=sector_details,
+        sectors_dict=sectors_dict,
+        unique_symbols=unique_symbols,
+        period=period,
+    )
+    return _run_agent(
+        prompt,
         model_id=model_id,
-        provider=model_provider,
-        api_key=openai_api_key,
+        model_provider=model_provider,
+        openai_api_key=openai_api_key,
         hf_token=hf_token,
-        api_base=openai_base_url,
+        openai_base_url=openai_base_url,
+        max_steps=max_steps,
+        executor_type=executor_type,
         temperature=temperature,
         max_tokens=max_tokens,
+        keep_alive=keep_alive,
+        additional_imports=FULL_AGENT_IMPORTS,
+        on_chunk=on_chunk,
     )
-    
-    agent = build_agent(model, LOW_LEVEL_TOOLS, max_steps=max_steps, executor_type=executor_type)
-    sector_details = "\n".join([f"- {name}: {symbols}" for name, symbols in sectors.items()])
-    prompt = MULTI_SECTOR_PROMPT.format(sector_details=sector_details, sectors_dict=sectors, period=period)
-    result = agent.run(prompt)
-    return format_agent_result(result)
 
 
 def run_combined_analysis(
@@ -1173,34 +1539,91 @@ def run_combined_analysis(
     executor_type: Literal["local", "e2b", "docker"] = "local",
     temperature: float = DEFAULT_TEMPERATURE,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    keep_alive: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
 ) -> str:
     """Run combined technical + fundamental analysis."""
-    configure_finance_tools()
-    
-    model = build_model(
+    prompt = _render_prompt(
+        _COMBINED_PARTS,
+        symbol=symbol,
+        technical_period=technical_period,
+        fundamental_period=fundamental_period,
+    )
+    return _run_agent(
+        prompt,
         model_id=model_id,
-        provider=model_provider,
-        api_key=openai_api_key,
+        model_provider=model_provider,
+        openai_api_key=openai_api_key,
         hf_token=hf_token,
-        api_base=openai_base_url,
+        openai_base_url=openai_base_url,
+        max_steps=max_steps,
+        executor_type=executor_type,
         temperature=temperature,
         max_tokens=max_tokens,
+        keep_alive=keep_alive,
+        additional_imports=("statistics",),
+        variables={"report_template": COMBINED_REPORT_TEMPLATE},
+        on_chunk=on_chunk,
     )
-    
-    agent = build_agent(model, LOW_LEVEL_TOOLS, max_steps=max_steps, executor_type=executor_type)
-    prompt = COMBINED_ANALYSIS_PROMPT.format(
-        symbol=symbol,
-        technical_period=technical_period,
-        fundamental_period=fundamental_period,
-    )
-    result = agent.run(prompt)
-    return format_agent_result(result)
 
 
 # ===========================================================================
 # CLI Entry Point
 # ===========================================================================
 
+_SCAN_PROGRESS = None
+
+
+def _init_scan_worker(counter, mcp_workers: int) -> None:
+    """Share the progress counter and size the MCP pool of a scanner worker process."""
+    from .tools import configure_finance_tools
+
+    global _SCAN_PROGRESS
+    _SCAN_PROGRESS = counter
+    # Every shard starts its own MCP servers; keep the total at shards x mcp_workers.
+    configure_finance_tools(workers=mcp_workers)
+
+
+def _scan_shard(symbols: list, options: Dict[str, Any]) -> str:
+    """Run the market scanner on one shard of symbols (worker process)."""
+    result = run_market_scanner(symbols=",".join(symbols), **options)
+    if _SCAN_PROGRESS is not None:
+        with _SCAN_PROGRESS.get_lock():
+            _SCAN_PROGRESS.value += len(symbols)
+    return result
+
+
+def run_sharded_market_scanner(symbols: list, mcp_workers_per_shard: int = 1, **options: Any) -> str:
+    """Split a long symbol list across worker processes and merge the reports.
+
+    Each shard process runs mcp_workers_per_shard MCP server processes; the
+    default of 1 keeps the total at one server per shard, since the shards
+    already spread the work over the CPUs.
+    """
+    shard_count = max(1, min(os.cpu_count() or 1, len(symbols) // 4))
+    shard_size = -(-len(symbols) // shard_count)
+    shards = [symbols[i:i + shard_size] for i in range(0, len(symbols), shard_size)]
+    
+    progress = multiprocessing.Value("i", 0)
+    reports: Dict[int, str] = {}
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        initializer=_init_scan_worker,
+        initargs=(progress, mcp_workers_per_shard),
+    ) as pool:
+        futures = {pool.submit(_scan_shard, shard, options): idx for idx, shard in enumerate(shards)}
+        for future in as_completed(futures):
+            reports[futures[future]] = future.result()
+            print(f"[scanner] {progress.value}/{len(symbols)} symbols scanned", file=sys.stderr)
+    
+    parts = [f"# Market Scanner Summary ({len(symbols)} symbols, {len(shards)} shards)\n\n"]
+    for idx, shard in enumerate(shards):
+        parts.append(f"## Shard {idx + 1}: {', '.join(shard)}\n\n")
+        parts.append(reports[idx])
+        parts.append("\n\n---\n\n")
+    return "".join(parts)
+
+
 def main():
     """CLI entry point for CodeAgent analysis."""
     parser = argparse.ArgumentParser(description="CodeAgent Stock Analysis")
@@ -1215,39 +1638,55 @@ def main():
                         default=DEFAULT_EXECUTOR, help="Code executor type")
     parser.add_argument("--temperature", type=float, default=DEFAULT_TEMPERATURE,
                         help="LLM temperature (default: 0.1)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print agent output as it is generated")
+    parser.add_argument("--output", type=Path,
+                        help="Append the final report to this file")
     
     args = parser.parse_args()
+    on_chunk = (lambda text: print(text, end="", flush=True)) if args.stream else None
     
-    try:
-        if args.mode == "technical":
-            result = run_technical_analysis(
-                symbol=args.symbol, period=args.period, model_id=args.model_id,
-                model_provider=args.model_provider, max_steps=args.max_steps,
-                executor_type=args.executor, temperature=args.temperature,
-            )
-        elif args.mode == "scanner":
-            result = run_market_scanner(
-                symbols=args.symbol, period=args.period, model_id=args.model_id,
-                model_provider=args.model_provider, max_steps=args.max_steps,
-                executor_type=args.executor, temperature=args.temperature,
-            )
-        elif args.mode == "fundamental":
-            result = run_fundamental_analysis(
-                symbol=args.symbol, period=args.period, model_id=args.model_id,
-                model_provider=args.model_provider, max_steps=args.max_steps,
-                executor_type=args.executor, temperature=args.temperature,
-            )
-        elif args.mode == "combined":
-            result = run_combined_analysis(
-                symbol=args.symbol, technical_period=args.period, model_id=args.model_id,
-                model_provider=args.model_provider, max_steps=args.max_steps,
-                executor_type=args.executor, temperature=args.temperature,
-            )
-        
-        print(result)
-        
-    finally:
-        shutdown_finance_tools()
+    if args.mode == "technical":
+        result = run_technical_analysis(
+            symbol=args.symbol, period=args.period, model_id=args.model_id,
+            model_provider=args.model_provider, max_steps=args.max_steps,
+            executor_type=args.executor, temperature=args.temperature,
+            on_chunk=on_chunk,
+        )
+    elif args.mode == "scanner":
+        symbol_list = _split_symbols(args.symbol)
+        scanner_options = dict(
+            period=args.period, model_id=args.model_id,
+            model_provider=args.model_provider, max_steps=args.max_steps,
+            executor_type=args.executor, temperature=args.temperature,
+        )
+        if len(symbol_list) > SCANNER_SHARD_THRESHOLD:
+            # Shards run in worker processes, so their output is not streamed.
+            result = run_sharded_market_scanner(symbol_list, **scanner_options)
+        else:
+            result = run_market_scanner(symbols=args.symbol, on_chunk=on_chunk, **scanner_options)
+    elif args.mode == "fundamental":
+        result = run_fundamental_analysis(
+            symbol=args.symbol, period=args.period, model_id=args.model_id,
+            model_provider=args.model_provider, max_steps=args.max_steps,
+            executor_type=args.executor, temperature=args.temperature,
+            on_chunk=on_chunk,
+        )
+    elif args.mode == "combined":
+        result = run_combined_analysis(
+            symbol=args.symbol, technical_period=args.period, model_id=args.model_id,
+            model_provider=args.model_provider, max_steps=args.max_steps,
+            executor_type=args.executor, temperature=args.temperature,
+            on_chunk=on_chunk,
+        )
+    
+    if args.stream:
+        print()
+    print(result)
+    if args.output:
+        with args.output.open("a", encoding="utf-8") as handle:
+            handle.write(result)
+            handle.write("\n")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import os
 import sys
 import threading
 from contextlib import AsyncExitStack
@@ -13,10 +13,17 @@ from typing import Any, Dict, Optional
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from .json_utils import dumps_json
+
 logger = logging.getLogger(__name__)
 
 _DEFAULT_SERVER_PATH = Path(__file__).resolve().parents[1] / "server" / "main.py"
 
+# The strategy tools are synchronous pandas/numpy code, so a single server
+# process runs them one at a time. Spreading calls over several server
+# processes lets CPU-bound backtests use more than one core.
+DEFAULT_POOL_SIZE = int(os.getenv("MCP_FINANCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 
 class MCPFinanceSession:
     """Manage a long-lived connection to the finance MCP server."""
@@ -94,7 +101,7 @@ class MCPFinanceSession:
                 continue
             as_json = getattr(item, "json", None)
             if as_json is not None:
-                chunks.append(json.dumps(as_json, indent=2))
+                chunks.append(dumps_json(as_json))
         return "\n".join(chunks).strip()
 
     def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> str:
@@ -130,27 +137,84 @@ class MCPFinanceSession:
             logger.debug("Disconnected from MCP server")
 
 
+class MCPFinanceSessionPool:
+    """Dispatch tool calls across several finance MCP server processes.
+
+    Sessions are started lazily, so sequential callers only ever spawn the
+    first server process; extra processes come up when calls overlap.
+    """
+
+    def __init__(self, server_path: Optional[Path] = None, size: int = DEFAULT_POOL_SIZE) -> None:
+        self._server_path = Path(server_path or _DEFAULT_SERVER_PATH)
+        self._sessions = [MCPFinanceSession(self._server_path) for _ in range(max(1, size))]
+        self._in_flight = [0] * len(self._sessions)
+        self._lock = threading.Lock()
+
+    @property
+    def server_path(self) -> Path:
+        return self._server_path
+
+    @property
+    def size(self) -> int:
+        return len(self._sessions)
+
+    def set_server_path(self, new_path: Path) -> None:
+        resolved = Path(new_path).resolve()
+        if resolved == self._server_path:
+            return
+        for session in self._sessions:
+            session.set_server_path(resolved)
+        self._server_path = resolved
+
+    def _acquire(self) -> int:
+        with self._lock:
+            index = min(range(len(self._sessions)), key=self._in_flight.__getitem__)
+            self._in_flight[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._in_flight[index] -= 1
+
+    def call_tool(self, tool_name: str, parameters: Dict[str, Any]) -> str:
+        index = self._acquire()
+        try:
+            return self._sessions[index].call_tool(tool_name, parameters)
+        finally:
+            self._release(index)
+
+    def close(self) -> None:
+        for session in self._sessions:
+            session.close()
+
+
 def _resolve_default_path() -> Path:
     return _DEFAULT_SERVER_PATH
 
 
-_SESSION: Optional[MCPFinanceSession] = None
+_SESSION: Optional[MCPFinanceSessionPool] = None
 
 
-def configure_session(server_path: Optional[str | Path] = None) -> None:
-    """Configure (or reconfigure) the shared MCP session."""
+def configure_session(
+    server_path: Optional[str | Path] = None,
+    pool_size: Optional[int] = None,
+) -> None:
+    """Configure (or reconfigure) the shared MCP session pool."""
     global _SESSION
     path = Path(server_path).resolve() if server_path else _resolve_default_path()
+    if _SESSION is not None and pool_size is not None and pool_size != _SESSION.size:
+        _SESSION.close()
+        _SESSION = None
     if _SESSION is None:
-        _SESSION = MCPFinanceSession(path)
+        _SESSION = MCPFinanceSessionPool(path, pool_size or DEFAULT_POOL_SIZE)
     else:
         _SESSION.set_server_path(path)
 
 
-def get_session() -> MCPFinanceSession:
+def get_session() -> MCPFinanceSessionPool:
     global _SESSION
     if _SESSION is None:
-        _SESSION = MCPFinanceSession(_resolve_default_path())
+        _SESSION = MCPFinanceSessionPool(_resolve_default_path())
     return _SESSION
 
 
@@ -20,15 +20,35 @@
 #   - macd_donchian_analysis: Single strategy, single stock
 #   - connors_zscore_analysis: Single strategy, single stock
 #   - dual_moving_average_analysis: Single strategy, single stock
+#   - run_all_strategies: All 4 strategies for one stock, called concurrently
+#   - scan_symbols: All 4 strategies for many stocks, called concurrently
 #   - fundamental_analysis_report: Financial data (also used by CodeAgent)
+#   - combined_analysis: 4 strategies + fundamentals for one stock, concurrently
+#   - graded_fundamental_report: Fundamental report plus a deterministic grade
+#
+# PARSING TOOLS (local, no MCP call):
+# Helpers that turn strategy tool output into structured values so the
+# generated code does not re-implement text scanning on every run.
+#
+#   - parse_strategy_metrics: Return, Sharpe, drawdown and score as reported
+#   - parse_signal: Current BUY/SELL/HOLD signal in one scan
+#   - parse_signal_strength: STRONG BUY/STRONG SELL/BUY/SELL/HOLD in one scan
+#   - parse_fundamental_outlook: POSITIVE/NEGATIVE/NEUTRAL fundamental outlook
+#   - classify_signals: Overall verdict, outlook, trend and risk from vote counts
 #
 #####################################################################
 """
 from __future__ import annotations
 
 import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from smolagents import tool
 
@@ -41,10 +61,12 @@ __all__ = [
     "HIGH_LEVEL_TOOLS",
     "LOW_LEVEL_TOOLS",
     "STRATEGY_TOOLS",
+    "PARSING_TOOLS",
     "ALL_TOOLS",
     # Configuration
     "configure_finance_tools",
     "shutdown_finance_tools",
+    "clear_finance_cache",
     # High-level tools
     "comprehensive_performance_report",
     "unified_market_scanner",
@@ -54,17 +76,49 @@ __all__ = [
     "macd_donchian_analysis",
     "connors_zscore_analysis",
     "dual_moving_average_analysis",
+    "run_all_strategies",
+    "scan_symbols",
+    "combined_analysis",
+    "graded_fundamental_report",
+    # Parsing tools
+    "parse_strategy_metrics",
+    "parse_signal",
+    "parse_signal_strength",
+    "parse_fundamental_outlook",
+    "classify_signals",
 ]
 
 
-def configure_finance_tools(server_path: str | Path | None = None) -> None:
-    """Initialize the MCP server connection."""
-    configure_session(server_path)
+# The session pool outlives individual runs; mcp_client shuts it down at exit.
+_SESSION_INITIALIZED = False
+
+
+def configure_finance_tools(
+    server_path: str | Path | None = None,
+    workers: int | None = None,
+) -> None:
+    """Initialize the MCP server connection.
+
+    Calling it again without arguments is a no-op, so every run can call it
+    without repeating the MCP handshake.
+
+    Args:
+        server_path: Path to the MCP server script (defaults to server/main.py).
+        workers: Number of MCP server processes to spread tool calls over.
+            Defaults to MCP_FINANCE_WORKERS or min(4, cpu_count).
+    """
+    global _SESSION_INITIALIZED
+    if _SESSION_INITIALIZED and server_path is None and workers is None:
+        return
+    configure_session(server_path, pool_size=workers)
+    _SESSION_INITIALIZED = True
 
 
 def shutdown_finance_tools() -> None:
     """Cleanly stop the MCP finance server session."""
+    global _SESSION_INITIALIZED
     shutdown_session()
+    _SESSION_INITIALIZED = False
 
 
 def _normalize_symbol(symbol: str) -> str:
@@ -75,13 +129,61 @@ def _normalize_symbol(symbol: str) -> str:
     return cleaned
 
 
+# Results are cached per (tool, parameters) so repeat scans over overlapping
+# tickers skip the MCP round-trip. Entries expire so market data stays fresh.
+CACHE_TTL_SECONDS = float(os.getenv("MCP_FINANCE_CACHE_TTL", "900"))
+CACHE_MAX_ENTRIES = int(os.getenv("MCP_FINANCE_CACHE_SIZE", "2048"))
+
+# Threads used by scan_symbols to overlap (symbol, strategy) calls.
+SCAN_MAX_WORKERS = int(os.getenv("MCP_FINANCE_SCAN_THREADS", "16"))
+
+_CACHE: "OrderedDict[tuple, tuple[float, str]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def clear_finance_cache() -> None:
+    """Drop all cached MCP tool results."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def _cache_get(key: tuple) -> Optional[str]:
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _CACHE[key]
+            return None
+        _CACHE.move_to_end(key)
+        return value
+
+
+def _cache_put(key: tuple, value: str) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic() + CACHE_TTL_SECONDS, value)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > CACHE_MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
 def _call_finance_tool(tool_name: str, parameters: Dict[str, object]) -> str:
-    """Execute an MCP tool and return the result."""
+    """Execute an MCP tool and return the result (cached for CACHE_TTL_SECONDS)."""
+    key = (tool_name, tuple(sorted(parameters.items())))
+    if CACHE_TTL_SECONDS > 0:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
     try:
-        return get_session().call_tool(tool_name, parameters)
+        result = get_session().call_tool(tool_name, parameters)
     except Exception as exc:
         logger.exception("Error while calling %s", tool_name)
         return f"Error calling {tool_name}: {exc}"
+    # Server-side failures come back as "Error..." text; retry those next time.
+    if CACHE_TTL_SECONDS > 0 and not result.startswith("Error"):
+        _cache_put(key, result)
+    return result
 
 
 # ===========================================================================
@@ -341,16 +443,410 @@ def dual_moving_average_analysis(
     return _call_finance_tool("analyze_dual_ma_strategy", params)
 
 
+# Result keys used by run_all_strategies, in report order.
+_STRATEGY_BY_KEY = {
+    "bollinger_fib": bollinger_fibonacci_analysis,
+    "macd_donchian": macd_donchian_analysis,
+    "connors_zscore": connors_zscore_analysis,
+    "dual_ma": dual_moving_average_analysis,
+}
+
+
+@tool
+def run_all_strategies(symbol: str, period: str = "1y") -> dict:
+    """Run all 4 strategy tools on one stock concurrently.
+
+    The four strategies have no data dependency on each other, so they are
+    issued in parallel and the total latency is that of the slowest call
+    rather than the sum of four round-trips. Default strategy parameters
+    are used; call the individual tools to tune them.
+
+    Args:
+        symbol: Stock ticker (e.g., 'AAPL').
+        period: Data period (default: '1y').
+
+    Returns:
+        Dict with keys 'bollinger_fib', 'macd_donchian', 'connors_zscore'
+        and 'dual_ma', each holding that strategy tool's text output.
+    """
+    with ThreadPoolExecutor(max_workers=len(_STRATEGY_BY_KEY)) as pool:
+        futures = {
+            key: pool.submit(strategy, symbol=symbol, period=period)
+            for key, strategy in _STRATEGY_BY_KEY.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+@tool
+def scan_symbols(symbols: list, period: str = "1y") -> dict:
+    """Run all 4 strategy tools on many stocks concurrently.
+
+    Every (symbol, strategy) pair is submitted to one thread pool, so a
+    20-ticker scan costs a few rounds of latency instead of 80 sequential
+    tool calls.
+
+    Args:
+        symbols: List of stock tickers (e.g., ['AAPL', 'MSFT']).
+        period: Data period (default: '1y').
+
+    Returns:
+        Nested dict {symbol: {'bollinger_fib', 'macd_donchian',
+        'connors_zscore', 'dual_ma': text output}} in input order.
+    """
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    tickers = [s.strip() for s in symbols if s and s.strip()]
+    with ThreadPoolExecutor(max_workers=max(1, SCAN_MAX_WORKERS)) as pool:
+        futures = {
+            symbol: {
+                key: pool.submit(strategy, symbol=symbol, period=period)
+                for key, strategy in _STRATEGY_BY_KEY.items()
+            }
+            for symbol in tickers
+        }
+        return {
+            symbol: {key: future.result() for key, future in by_key.items()}
+            for symbol, by_key in futures.items()
+        }
+
+
+@tool
+def combined_analysis(
+    symbol: str,
+    technical_period: str = "1y",
+    fundamental_period: str = "3y",
+) -> dict:
+    """Run all 4 strategy tools and the fundamental report on one stock concurrently.
+
+    Replaces five separate tool calls with one: the fundamental report is
+    fetched alongside the technical strategies instead of after them.
+
+    Args:
+        symbol: Stock ticker (e.g., 'AAPL').
+        technical_period: Data period for the strategies (default: '1y').
+        fundamental_period: Years of financial data (default: '3y').
+
+    Returns:
+        Dict with 'fundamentals' (fundamental report text) and 'technical'
+        (dict keyed 'bollinger_fib', 'macd_donchian', 'connors_zscore',
+        'dual_ma' with each strategy's text output).
+    """
+    with ThreadPoolExecutor(max_workers=len(_STRATEGY_BY_KEY) + 1) as pool:
+        fundamentals = pool.submit(
+            fundamental_analysis_report, symbol=symbol, period=fundamental_period
+        )
+        technical = {
+            key: pool.submit(strategy, symbol=symbol, period=technical_period)
+            for key, strategy in _STRATEGY_BY_KEY.items()
+        }
+        return {
+            "fundamentals": fundamentals.result(),
+            "technical": {key: future.result() for key, future in technical.items()},
+        }
+
+
+@tool
+def graded_fundamental_report(symbol: str, period: str = "3y") -> dict:
+    """Fetch the fundamental report for one stock and grade it.
+
+    The grade is computed locally from the report text, so the agent only
+    copies it into the answer instead of judging it.
+
+    Args:
+        symbol: Stock ticker to analyze (e.g., 'AAPL').
+        period: Years of historical financial data (default: '3y').
+
+    Returns:
+        Dict with 'assessment' (STRONG BUY/BUY/HOLD/SELL/STRONG SELL),
+        'health' (STRONG/GOOD/MODERATE/WEAK), 'grade' (A/B/C/D/F) and
+        'report' (the fundamental_analysis_report text).
+    """
+    report = fundamental_analysis_report(symbol=symbol, period=period)
+    graded = _grade_fundamentals(report)
+    graded["report"] = report
+    return graded
+
+
+# ===========================================================================
+# PARSING TOOLS (Local helpers - no MCP round-trip)
+# ===========================================================================
+
+# One pass over the tool output finds every labelled metric. Labels are
+# listed in priority order per metric, mirroring the fallbacks the prompts
+# used to spell out as separate regex searches.
+_METRIC_LABELS: Dict[str, tuple] = {
+    "return": ("strategy total return", "strategy return"),
+    "sharpe": ("strategy sharpe ratio", "sharpe ratio"),
+    "drawdown": ("strategy max drawdown", "max drawdown"),
+    "score": ("combined score", "current bb score", "trend strength"),
+}
+# Labels whose value only counts when followed by a % sign
+_PERCENT_LABELS = {
+    "strategy total return",
+    "strategy return",
+    "strategy max drawdown",
+    "max drawdown",
+    "trend strength",
+}
+_LABEL_TO_METRIC = {
+    label: (metric, priority)
+    for metric, labels in _METRIC_LABELS.items()
+    for priority, label in enumerate(labels)
+}
+_METRIC_RE = re.compile(
+    r"(?P<label>"
+    + "|".join(re.escape(label) for labels in _METRIC_LABELS.values() for label in labels)
+    + r")[:\s]+(?P<value>-?[\d.]+)(?P<pct>%)?",
+    re.IGNORECASE,
+)
+
+
+@tool
+def parse_strategy_metrics(text: str) -> dict:
+    """Extract performance metrics from a strategy tool result.
+
+    Scans the text once and returns the backtest metrics exactly as the tool
+    printed them, so generated code does not need its own regex helpers.
+
+    Args:
+        text: Raw output of one of the strategy analysis tools.
+
+    Returns:
+        Dict with keys 'return', 'sharpe', 'drawdown' and 'score'. Values are
+        the reported numbers as strings (e.g. '12.50', percentages without
+        the % sign) or None when not reported.
+    """
+    best: Dict[str, tuple] = {}
+    for match in _METRIC_RE.finditer(text):
+        label = match.group("label").lower()
+        metric, priority = _LABEL_TO_METRIC[label]
+        if label in _PERCENT_LABELS and not match.group("pct"):
+            continue
+        if metric in best and best[metric][0] <= priority:
+            continue
+        best[metric] = (priority, match.group("value"))
+    metrics: Dict[str, Optional[str]] = {metric: None for metric in _METRIC_LABELS}
+    for metric, (_, value) in best.items():
+        metrics[metric] = value
+    return metrics
+
+
+# Signal phrases in priority order (lower wins). One alternation finds all of
+# them in a single scan instead of a ladder of `"X" in text.upper()` checks.
+_SIGNAL_PHRASES = (
+    ("current signal: buy", 0, "BUY"),
+    ("current signal: sell", 1, "SELL"),
+    ("current signal: hold", 2, "HOLD"),
+    ("enter long", 3, "BUY"),
+    ("enter short", 4, "SELL"),
+    ("strong buy", 5, "BUY"),
+    ("buy signal", 5, "BUY"),
+    ("strong sell", 6, "SELL"),
+    ("sell signal", 6, "SELL"),
+)
+_SIGNAL_BY_PHRASE = {phrase: (priority, signal) for phrase, priority, signal in _SIGNAL_PHRASES}
+_SIGNAL_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase, _, _ in _SIGNAL_PHRASES),
+    re.IGNORECASE,
+)
+_SIGNAL_TAIL_CHARS = 500
+_SIGNAL_TAIL_RE = re.compile("BUY|SELL", re.IGNORECASE)
+
+
+@tool
+def parse_signal(text: str) -> str:
+    """Extract the current trading signal from a strategy tool result.
+
+    Looks for 'Current Signal: X' first, then 'Enter Long/Short', then
+    'Strong Buy'/'Buy Signal' style wording. If none is present, the last
+    500 characters decide by BUY/SELL majority (at least two mentions).
+
+    Args:
+        text: Raw output of one of the strategy analysis tools.
+
+    Returns:
+        'BUY', 'SELL' or 'HOLD'.
+    """
+    best = None
+    for match in _SIGNAL_RE.finditer(text):
+        found = _SIGNAL_BY_PHRASE[match.group(0).lower()]
+        if best is None or found[0] < best[0]:
+            best = found
+            if best[0] == 0:
+                break
+    if best is not None:
+        return best[1]
+
+    # pos= windows the scan without copying or upper-casing the tail
+    tally = _SIGNAL_TAIL_RE.findall(text, max(0, len(text) - _SIGNAL_TAIL_CHARS))
+    buy_count = sum(1 for word in tally if word.upper() == "BUY")
+    sell_count = len(tally) - buy_count
+    if buy_count > sell_count and buy_count >= 2:
+        return "BUY"
+    if sell_count > buy_count and sell_count >= 2:
+        return "SELL"
+    return "HOLD"
+
+
+# Strongest wording wins: STRONG BUY > STRONG SELL > BUY > SELL (else HOLD)
+_STRENGTH_PRIORITY = {"STRONG BUY": 0, "STRONG SELL": 1, "BUY": 2, "SELL": 3}
+_STRENGTH_RE = re.compile(r"STRONG BUY|STRONG SELL|BUY|SELL", re.IGNORECASE)
+
+
+@tool
+def parse_signal_strength(text: str) -> str:
+    """Rate the strongest signal wording in a strategy tool result.
+
+    Unlike parse_signal this does not look for 'Current Signal:'; it reports
+    the strongest BUY/SELL wording found anywhere in the text.
+
+    Args:
+        text: Raw output of one of the strategy analysis tools.
+
+    Returns:
+        'STRONG BUY', 'STRONG SELL', 'BUY', 'SELL' or 'HOLD'.
+    """
+    best = None
+    for match in _STRENGTH_RE.finditer(text):
+        word = match.group(0).upper()
+        if best is None or _STRENGTH_PRIORITY[word] < _STRENGTH_PRIORITY[best]:
+            best = word
+            if _STRENGTH_PRIORITY[best] == 0:
+                break
+    return best or "HOLD"
+
+
+# Explicit verdicts checked in order before falling back to word counts
+_FUND_VERDICTS = (
+    (("STRONG BUY", "INVESTMENT GRADE: A"), "POSITIVE"),
+    (("STRONG SELL", "INVESTMENT GRADE: F", "INVESTMENT GRADE: D"), "NEGATIVE"),
+    (("FINANCIAL HEALTH: STRONG", "HEALTH: STRONG"), "POSITIVE"),
+    (("FINANCIAL HEALTH: WEAK", "HEALTH: WEAK"), "NEGATIVE"),
+)
+_FUND_POSITIVE_WORDS = ("STRONG", "GOOD", "POSITIVE", "BUY")
+_FUND_NEGATIVE_WORDS = ("WEAK", "POOR", "NEGATIVE", "SELL", "CONCERN")
+
+
+@tool
+def parse_fundamental_outlook(text: str) -> str:
+    """Classify a fundamental analysis report as positive, negative or neutral.
+
+    Explicit grades and health verdicts win; otherwise positive and negative
+    wording is counted.
+
+    Args:
+        text: Raw output of fundamental_analysis_report.
+
+    Returns:
+        'POSITIVE', 'NEGATIVE' or 'NEUTRAL'.
+    """
+    upper = text.upper()
+    for phrases, outlook in _FUND_VERDICTS:
+        if any(phrase in upper for phrase in phrases):
+            return outlook
+
+    positive = sum(upper.count(word) for word in _FUND_POSITIVE_WORDS)
+    negative = sum(upper.count(word) for word in _FUND_NEGATIVE_WORDS)
+    if positive > negative:
+        return "POSITIVE"
+    if negative > positive:
+        return "NEGATIVE"
+    return "NEUTRAL"
+
+
+# (assessment, health, grade) for each explicit recommendation
+_FUND_GRADES = {
+    "STRONG BUY": ("STRONG BUY", "STRONG", "A"),
+    "BUY": ("BUY", "GOOD", "B"),
+    "HOLD": ("HOLD", "MODERATE", "C"),
+    "SELL": ("SELL", "WEAK", "D"),
+    "STRONG SELL": ("STRONG SELL", "WEAK", "F"),
+}
+# A recommendation/assessment/rating/verdict line whose value starts with
+# one of the _STRENGTH_RE wordings (or HOLD), e.g. "**Recommendation:** BUY"
+_FUND_VERDICT_RE = re.compile(
+    r"^[^\w\n]*(?:overall\s+|final\s+|investment\s+)?"
+    r"(?:recommendation|assessment|rating|verdict)\b[^:\n]*:[ \t*_]*"
+    r"(" + _STRENGTH_RE.pattern + r"|HOLD)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _grade_fundamentals(text: str) -> Dict[str, str]:
+    """Grade a fundamental report from its explicit recommendation line.
+
+    Only the value right after the label counts, so wording elsewhere in the
+    report ("financial health: strong", "not a buy") cannot change the grade.
+    The first recommendation line wins; reports without one grade as HOLD.
+    """
+    match = _FUND_VERDICT_RE.search(text)
+    level = match.group(1).upper() if match else "HOLD"
+    assessment, health, grade = _FUND_GRADES[level]
+    return {"assessment": assessment, "health": health, "grade": grade}
+
+
+def _classify(buy_count: int, sell_count: int) -> Dict[str, str]:
+    """Map BUY/SELL vote counts across the 4 strategies to a verdict."""
+    if buy_count >= 3:
+        overall, outlook = "STRONG BUY", "BULLISH"
+    elif buy_count >= 2:
+        overall, outlook = "BUY", "MODERATELY BULLISH"
+    elif sell_count >= 3:
+        overall, outlook = "STRONG SELL", "BEARISH"
+    elif sell_count >= 2:
+        overall, outlook = "SELL", "MODERATELY BEARISH"
+    else:
+        overall, outlook = "HOLD", "NEUTRAL"
+
+    if buy_count > sell_count:
+        trend = "Up"
+    elif sell_count > buy_count:
+        trend = "Down"
+    else:
+        trend = "Sideways"
+
+    if buy_count >= 3 or sell_count >= 3:
+        risk = "Low"
+    elif buy_count >= 2 or sell_count >= 2:
+        risk = "Medium"
+    else:
+        risk = "High"
+    return {"overall": overall, "outlook": outlook, "trend": trend, "risk": risk}
+
+
+# Every (buy, sell) pair for 4 strategies, computed once at import
+_SIGNAL_VERDICTS = {(b, s): _classify(b, s) for b in range(5) for s in range(5)}
+
+
+@tool
+def classify_signals(buy_count: int, sell_count: int) -> dict:
+    """Turn BUY/SELL vote counts across the 4 strategies into a verdict.
+
+    Args:
+        buy_count: Number of strategies signalling BUY (0-4).
+        sell_count: Number of strategies signalling SELL (0-4).
+
+    Returns:
+        Dict with 'overall' (STRONG BUY/BUY/HOLD/SELL/STRONG SELL),
+        'outlook' (BULLISH ... BEARISH), 'trend' (Up/Down/Sideways) and
+        'risk' (Low/Medium/High).
+    """
+    verdict = _SIGNAL_VERDICTS.get((buy_count, sell_count))
+    return dict(verdict) if verdict is not None else _classify(buy_count, sell_count)
+
+
 # ===========================================================================
 # TOOL COLLECTIONS
 # ===========================================================================
 
-# Low-level strategy tools (4 individual strategies)
+# Low-level strategy tools (4 individual strategies + concurrent fan-out)
 STRATEGY_TOOLS: List = [
     bollinger_fibonacci_analysis,
     macd_donchian_analysis,
     connors_zscore_analysis,
     dual_moving_average_analysis,
+    run_all_strategies,
+    scan_symbols,
 ]
 
 # High-level tools (for ToolCallingAgent - one call does everything)
@@ -360,14 +856,28 @@ HIGH_LEVEL_TOOLS: List = [
     fundamental_analysis_report,
 ]
 
+# Local parsing helpers (no MCP call)
+PARSING_TOOLS: List = [
+    parse_strategy_metrics,
+    parse_signal,
+    parse_signal_strength,
+    parse_fundamental_outlook,
+    classify_signals,
+]
+
 # Low-level tools for CodeAgent (strategies + fundamental for combined analysis)
 LOW_LEVEL_TOOLS: List = [
     *STRATEGY_TOOLS,
     fundamental_analysis_report,  # CodeAgent needs this for combined analysis
+    combined_analysis,
+    *PARSING_TOOLS,
 ]
 
-# All tools combined (for reference)
+# All tools combined (every @tool defined in this module)
 ALL_TOOLS: List = [
     *STRATEGY_TOOLS,
     *HIGH_LEVEL_TOOLS,
+    combined_analysis,
+    graded_fundamental_report,
+    *PARSING_TOOLS,
 ]
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""Unit tests for the local parsing tools and the MCP result cache.
+
+These run without an MCP server or LLM:
+
+    pytest test_parsing_tools.py
+
+The legacy_* helpers are the inline implementations the generated code used
+before the parsers moved into stock_analyzer_bot.tools; the randomized tests
+check the tools still agree with them.
+"""
+from __future__ import annotations
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stock_analyzer_bot import mcp_client, tools
+
+
+# ---------------------------------------------------------------------------
+# Legacy implementations (reference behaviour)
+# ---------------------------------------------------------------------------
+
+def legacy_get_metrics(text):
+    def extract_value(patterns):
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+
+    return {
+        "return": extract_value([r"Strategy Total Return[:\s]+([\-]?[\d.]+)%", r"Strategy Return[:\s]+([\-]?[\d.]+)%"]),
+        "sharpe": extract_value([r"Strategy Sharpe Ratio[:\s]+([\-]?[\d.]+)", r"Sharpe Ratio[:\s]+([\-]?[\d.]+)"]),
+        "drawdown": extract_value([r"Strategy Max Drawdown[:\s]+([\-]?[\d.]+)%", r"Max Drawdown[:\s]+([\-]?[\d.]+)%"]),
+        "score": extract_value([r"Combined Score[:\s]+([\-]?[\d.]+)", r"Current BB Score[:\s]+([\-]?[\d.]+)", r"Trend Strength[:\s]+([\-]?[\d.]+)%"]),
+    }
+
+
+def legacy_current_signal(tool_output):
+    text = tool_output.upper()
+    if "CURRENT SIGNAL: BUY" in text:
+        return "BUY"
+    if "CURRENT SIGNAL: SELL" in text:
+        return "SELL"
+    if "CURRENT SIGNAL: HOLD" in text:
+        return "HOLD"
+    if "ENTER LONG" in text:
+        return "BUY"
+    if "ENTER SHORT" in text:
+        return "SELL"
+    if "STRONG BUY" in text or "BUY SIGNAL" in text:
+        return "BUY"
+    if "STRONG SELL" in text or "SELL SIGNAL" in text:
+        return "SELL"
+    last_section = text[-500:] if len(text) > 500 else text
+    buy_count = last_section.count("BUY")
+    sell_count = last_section.count("SELL")
+    if buy_count > sell_count and buy_count >= 2:
+        return "BUY"
+    if sell_count > buy_count and sell_count >= 2:
+        return "SELL"
+    return "HOLD"
+
+
+def legacy_signal_strength(result):
+    text = result.upper()
+    if "STRONG BUY" in text:
+        return "STRONG BUY"
+    elif "STRONG SELL" in text:
+        return "STRONG SELL"
+    elif "BUY" in text:
+        return "BUY"
+    elif "SELL" in text:
+        return "SELL"
+    return "HOLD"
+
+
+def legacy_verdict(buy_count, sell_count):
+    if buy_count >= 3:
+        overall, outlook = "STRONG BUY", "BULLISH"
+    elif buy_count >= 2:
+        overall, outlook = "BUY", "MODERATELY BULLISH"
+    elif sell_count >= 3:
+        overall, outlook = "STRONG SELL", "BEARISH"
+    elif sell_count >= 2:
+        overall, outlook = "SELL", "MODERATELY BEARISH"
+    else:
+        overall, outlook = "HOLD", "NEUTRAL"
+    trend = "Up" if buy_count > sell_count else "Down" if sell_count > buy_count else "Sideways"
+    risk = "Low" if buy_count >= 3 or sell_count >= 3 else "Medium" if buy_count >= 2 or sell_count >= 2 else "High"
+    return {"overall": overall, "outlook": outlook, "trend": trend, "risk": risk}
+
+
+def random_texts(tokens, count=3000, max_tokens=12, seed=1234):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(tokens) for _ in range(rng.randint(0, max_tokens)))
+
+
+# ---------------------------------------------------------------------------
+# parse_strategy_metrics
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (
+            "Strategy Total Return: 12.50%\nStrategy Sharpe Ratio: 1.20\n"
+            "Strategy Max Drawdown: -8.10%\nCombined Score: 42",
+            {"return": "12.50", "sharpe": "1.20", "drawdown": "-8.10", "score": "42"},
+        ),
+        # Fallback labels are used only when the preferred label is missing
+        (
+            "Strategy Return: 3%\nSharpe Ratio: 0.5\nMax Drawdown: 2%\nCurrent BB Score: 7",
+            {"return": "3", "sharpe": "0.5", "drawdown": "2", "score": "7"},
+        ),
+        (
+            "Sharpe Ratio: 0.1\nStrategy Sharpe Ratio: 0.9",
+            {"return": None, "sharpe": "0.9", "drawdown": None, "score": None},
+        ),
+        # Percent metrics and Trend Strength need a % sign
+        (
+            "Strategy Total Return: 5\nMax Drawdown: 4\nTrend Strength: 60",
+            {"return": None, "sharpe": None, "drawdown": None, "score": None},
+        ),
+        (
+            "Trend Strength: 60%",
+            {"return": None, "sharpe": None, "drawdown": None, "score": "60"},
+        ),
+        ("", {"return": None, "sharpe": None, "drawdown": None, "score": None}),
+    ],
+)
+def test_parse_strategy_metrics(text, expected):
+    assert tools.parse_strategy_metrics(text=text) == expected
+
+
+def test_parse_strategy_metrics_matches_legacy():
+    fragments = [
+        "Strategy Total Return", "Strategy Return", "strategy sharpe ratio", "Sharpe Ratio",
+        "Strategy Max Drawdown", "max drawdown", "Combined Score", "Current BB Score",
+        "Trend Strength", ": ", " ", "\n", "-", "12", ".", "5", "%", "x",
+    ]
+    for text in random_texts(fragments):
+        assert tools.parse_strategy_metrics(text=text) == legacy_get_metrics(text), text
+
+
+# ---------------------------------------------------------------------------
+# parse_signal / parse_signal_strength
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("• Current Signal: BUY", "BUY"),
+        ("current signal: sell\nStrong Buy", "SELL"),
+        ("Current Signal: HOLD\nEnter Long Position", "HOLD"),
+        ("Strategy Recommendation: Enter Short Position", "SELL"),
+        ("Trading Signal: Buy Signal", "BUY"),
+        ("Strong Sell", "SELL"),
+        ("BUY ... BUY ... SELL", "BUY"),
+        ("SELL then SELL", "SELL"),
+        ("one BUY only", "HOLD"),
+        ("", "HOLD"),
+    ],
+)
+def test_parse_signal(text, expected):
+    assert tools.parse_signal(text=text) == expected
+
+
+def test_parse_signal_matches_legacy():
+    fragments = [
+        "Current Signal: ", "current signal: ", "BUY", "sell", "HOLD", "Enter Long",
+        "enter short", "Strong ", "Buy Signal", "SELL SIGNAL", " ", "x" * 120, "\n",
+    ]
+    for text in random_texts(fragments):
+        assert tools.parse_signal(text=text) == legacy_current_signal(text), text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Strong Buy", "STRONG BUY"),
+        ("strong sell and strong buy", "STRONG BUY"),
+        ("Strong Sell, then Buy", "STRONG SELL"),
+        ("Sell now, Buy later", "BUY"),
+        ("sell", "SELL"),
+        ("nothing here", "HOLD"),
+    ],
+)
+def test_parse_signal_strength(text, expected):
+    assert tools.parse_signal_strength(text=text) == expected
+
+
+def test_parse_signal_strength_matches_legacy():
+    fragments = ["STRONG ", "strong ", "BUY", "buy", "SELL", "sell", " ", "x", "STRONGBUY"]
+    for text in random_texts(fragments):
+        assert tools.parse_signal_strength(text=text) == legacy_signal_strength(text), text
+
+
+# ---------------------------------------------------------------------------
+# classify_signals / fundamental grading
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "buy, sell, overall, outlook, trend, risk",
+    [
+        (4, 0, "STRONG BUY", "BULLISH", "Up", "Low"),
+        (2, 2, "BUY", "MODERATELY BULLISH", "Sideways", "Medium"),
+        (1, 3, "STRONG SELL", "BEARISH", "Down", "Low"),
+        (0, 2, "SELL", "MODERATELY BEARISH", "Down", "Medium"),
+        (1, 1, "HOLD", "NEUTRAL", "Sideways", "High"),
+        (0, 0, "HOLD", "NEUTRAL", "Sideways", "High"),
+    ],
+)
+def test_classify_signals(buy, sell, overall, outlook, trend, risk):
+    assert tools.classify_signals(buy_count=buy, sell_count=sell) == {
+        "overall": overall, "outlook": outlook, "trend": trend, "risk": risk,
+    }
+
+
+def test_classify_signals_matches_legacy_ladder():
+    for buy in range(5):
+        for sell in range(5 - buy):
+            assert tools.classify_signals(buy_count=buy, sell_count=sell) == legacy_verdict(buy, sell)
+
+
+def test_classify_signals_returns_a_copy():
+    tools.classify_signals(buy_count=4, sell_count=0)["overall"] = "changed"
+    assert tools.classify_signals(buy_count=4, sell_count=0)["overall"] == "STRONG BUY"
+
+
+@pytest.mark.parametrize(
+    "text, assessment, grade",
+    [
+        ("Financial health: STRONG\nRecommendation: SELL (no BUY case)", "SELL", "D"),
+        ("Recommendation: STRONG SELL\nSome analysts still buy the dip.", "STRONG SELL", "F"),
+        ("Assessment: not a BUY at these levels", "HOLD", "C"),
+        ("**Recommendation:** buy", "BUY", "B"),
+        ("## 🎯 RECOMMENDATION: **STRONG BUY**", "STRONG BUY", "A"),
+        ("- Overall rating (12m): HOLD\nStrong margins, buy-side interest.", "HOLD", "C"),
+        ("Recommendation: BUYBACK programme announced", "HOLD", "C"),
+        ("Strong net profit margin (>20%). Analysts say buy.", "HOLD", "C"),
+        ("Verdict: SELL\nRecommendation: BUY", "SELL", "D"),
+    ],
+)
+def test_grade_fundamentals_uses_explicit_recommendation(text, assessment, grade):
+    graded = tools._grade_fundamentals(text)
+    assert graded["assessment"] == assessment
+    assert graded["grade"] == grade
+
+
+# ---------------------------------------------------------------------------
+# MCP result cache
+# ---------------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, result="report"):
+        self.result = result
+        self.calls = []
+
+    def call_tool(self, tool_name, parameters):
+        self.calls.append((tool_name, parameters))
+        return self.result
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(tools.time, "monotonic", fake)
+    tools.clear_finance_cache()
+    yield fake
+    tools.clear_finance_cache()
+
+
+def test_cache_entry_expires_after_ttl(clock, monkeypatch):
+    monkeypatch.setattr(tools, "CACHE_TTL_SECONDS", 60.0)
+    tools._cache_put(("tool", ()), "value")
+    clock.now += 59
+    assert tools._cache_get(("tool", ())) == "value"
+    clock.now += 2
+    assert tools._cache_get(("tool", ())) is None
+
+
+def test_cache_evicts_least_recently_used(clock, monkeypatch):
+    monkeypatch.setattr(tools, "CACHE_MAX_ENTRIES", 2)
+    tools._cache_put(("a", ()), "A")
+    tools._cache_put(("b", ()), "B")
+    assert tools._cache_get(("a", ())) == "A"  # "b" is now the oldest
+    tools._cache_put(("c", ()), "C")
+    assert tools._cache_get(("b", ())) is None
+    assert tools._cache_get(("a", ())) == "A"
+    assert tools._cache_get(("c", ())) == "C"
+
+
+def test_call_finance_tool_caches_by_tool_and_params(clock, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(tools, "get_session", lambda: session)
+    params = {"symbol": "AAPL", "period": "1y"}
+    assert tools._call_finance_tool("analyze_dual_ma_strategy", params) == "report"
+    assert tools._call_finance_tool("analyze_dual_ma_strategy", dict(reversed(params.items()))) == "report"
+    assert len(session.calls) == 1
+    tools._call_finance_tool("generate_fundamental_analysis_report", params)
+    assert len(session.calls) == 2
+
+
+def test_call_finance_tool_does_not_cache_errors(clock, monkeypatch):
+    session = FakeSession(result="Error: no data")
+    monkeypatch.setattr(tools, "get_session", lambda: session)
+    tools._call_finance_tool("market_scanner", {"symbols": "AAPL"})
+    tools._call_finance_tool("market_scanner", {"symbols": "AAPL"})
+    assert len(session.calls) == 2
+
+
+def test_session_pool_routes_to_least_busy_session():
+    pool = mcp_client.MCPFinanceSessionPool(size=3)
+    # Calls for the same symbol still spread out while earlier ones run
+    assert [pool._acquire() for _ in range(3)] == [0, 1, 2]
+    pool._release(1)
+    assert pool._acquire() == 1
+
+
+def test_all_tools_lists_every_tool():
+    from smolagents import Tool
+
+    defined = {obj.name for obj in vars(tools).values() if isinstance(obj, Tool)}
+    listed = [t.name for t in tools.ALL_TOOLS]
+    assert len(listed) == len(set(listed))
+    assert set(listed) == defined